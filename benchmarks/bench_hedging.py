@@ -0,0 +1,129 @@
+"""
+Tail-latency benchmark for LLMClient hedging and deadlines, against a local fake
+OpenAI server with injected slow responses (benchmarks.fake_openai_server).
+
+1. The same workload with hedging off and on: latency percentiles, hedges fired/won.
+2. Deadline propagation: a case routed with `deadline_s` against an all-slow server
+   must fail with DeadlineExceeded close to the deadline, not after the slow response.
+
+Usage:
+    python -m benchmarks.bench_hedging
+    python -m benchmarks.bench_hedging --calls 400 --slow-ratio 0.05 --slow-ms 1500 --hedge-percentile 90
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.call_context import DeadlineExceeded
+from core.llm_client import LLMClient
+
+from benchmarks.bench_pipeline import percentiles
+from benchmarks.fake_openai_server import FakeOpenAIServer
+from benchmarks.fixtures import PROSE_FORM
+from products.transfer_orchestrator.prompts import EXTRACT_SYSTEM, EXTRACT_USER
+from products.transfer_orchestrator.workflow import build_router
+
+MESSAGES = [
+    {"role": "system", "content": EXTRACT_SYSTEM},
+    {"role": "user", "content": EXTRACT_USER.format(document_text=PROSE_FORM)},
+]
+
+
+def run_calls(llm: LLMClient, calls: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+
+    def one(_: int) -> None:
+        t0 = time.perf_counter()
+        llm.chat(MESSAGES, temperature=0.1, json_mode=True)
+        latencies.append(time.perf_counter() - t0)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(calls)))
+    return percentiles(latencies)
+
+
+def bench_hedging(server: FakeOpenAIServer, *, calls: int, concurrency: int,
+                  hedge_percentile: float, warmup: int) -> dict:
+    results = {}
+    for label, percentile in (("no_hedge", None), (f"hedge_p{hedge_percentile:g}", hedge_percentile)):
+        llm = LLMClient(cache=None, max_concurrency=concurrency * 2, hedge_percentile=percentile)
+        try:
+            run_calls(llm, warmup, concurrency)  # fills the latency window the hedge threshold uses
+            llm.aclient.hedge_stats.clear()
+            before = dict(server.stats)
+            out = run_calls(llm, calls, concurrency)
+            out["hedges"] = dict(llm.aclient.hedge_stats)
+            out["server_requests"] = server.stats["requests"] - before.get("requests", 0)
+            results[label] = out
+        finally:
+            llm.close()
+    return results
+
+
+def bench_deadline(server: FakeOpenAIServer, deadline_s: float) -> dict:
+    slow_ratio, server.slow_ratio = server.slow_ratio, 1.0
+    llm = LLMClient(cache=None)
+    try:
+        router, tools = build_router(llm)
+        t0 = time.perf_counter()
+        try:
+            router.route({"document_text": PROSE_FORM, "deadline_s": deadline_s})
+            outcome = "completed"
+        except DeadlineExceeded:
+            outcome = "DeadlineExceeded"
+        elapsed = time.perf_counter() - t0
+    finally:
+        server.slow_ratio = slow_ratio
+        llm.close()
+    return {
+        "deadline_s": deadline_s,
+        "outcome": outcome,
+        "elapsed_s": round(elapsed, 3),
+        "tool_log": [(e["tool"], e["status"]) for e in tools.get_log()],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Hedging/deadline benchmark against a fake OpenAI server.")
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--slow-ratio", type=float, default=0.05)
+    parser.add_argument("--slow-ms", type=float, default=1000.0)
+    parser.add_argument("--hedge-percentile", type=float, default=90.0)
+    parser.add_argument("--deadline-s", type=float, default=0.3)
+    parser.add_argument("--out", help="write JSON results here")
+    args = parser.parse_args(argv)
+
+    server = FakeOpenAIServer(latency_ms=args.latency_ms, slow_ratio=args.slow_ratio, slow_ms=args.slow_ms).start()
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+    try:
+        hedging = bench_hedging(server, calls=args.calls, concurrency=args.concurrency,
+                                hedge_percentile=args.hedge_percentile, warmup=args.warmup)
+        deadline = bench_deadline(server, args.deadline_s)
+    finally:
+        server.shutdown()
+
+    for label, s in hedging.items():
+        print(f"{label:12s} p50={s['p50_ms']:8.1f}ms  p90={s['p90_ms']:8.1f}ms  p99={s['p99_ms']:8.1f}ms  "
+              f"max={s['max_ms']:8.1f}ms  requests={s['server_requests']}  hedges={s['hedges']}")
+    print(f"deadline {deadline['deadline_s']}s: {deadline['outcome']} after {deadline['elapsed_s']}s "
+          f"{deadline['tool_log']}")
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "hedging": hedging, "deadline": deadline}, f, indent=2)
+    # the deadline must hold to within the time of one fast request
+    return 0 if deadline["outcome"] == "DeadlineExceeded" and deadline["elapsed_s"] < args.deadline_s + 0.2 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
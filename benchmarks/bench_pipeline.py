@@ -0,0 +1,217 @@
+"""
+End-to-end benchmark for the transfer pipeline, using FakeLLMClient (no API key needed).
+
+Usage:
+    python -m benchmarks.bench_pipeline --out bench/HEAD.json
+    python -m benchmarks.bench_pipeline --llm-latency-ms 400 --concurrency 1 4 16
+    python -m benchmarks.bench_pipeline --out bench/new.json --compare bench/old.json
+
+Reports per-stage and end-to-end latency percentiles plus cases/sec per concurrency level.
+Results are JSON so runs on different commits can be diffed with --compare.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable
+
+from core.metrics import ToolMetrics
+from core.tool_registry import ToolRegistry
+
+from benchmarks.fake_llm import CANNED_EXTRACT, FakeLLMClient
+from benchmarks.fixtures import LABELLED_FORM, PROSE_FORM, transfer_package_pdf
+from products.transfer_orchestrator import db
+from products.transfer_orchestrator.cascade import CascadePolicy
+from products.transfer_orchestrator.tools import extract_text_from_pdf, normalize_text, validate_fields
+from products.transfer_orchestrator.workflow import REVIEW_MODES, build_router
+
+
+def percentiles(samples_s: list[float]) -> dict:
+    """
+    Summary in milliseconds (nearest-rank percentiles).
+    """
+    if not samples_s:
+        return {"n": 0}
+    xs = sorted(samples_s)
+
+    def pct(p: float) -> float:
+        return xs[max(0, math.ceil(p / 100 * len(xs)) - 1)] * 1000
+
+    return {
+        "n": len(xs),
+        "mean_ms": sum(xs) / len(xs) * 1000,
+        "p50_ms": pct(50),
+        "p90_ms": pct(90),
+        "p99_ms": pct(99),
+        "max_ms": xs[-1] * 1000,
+    }
+
+
+def time_calls(fn: Callable[[], object], n: int) -> dict:
+    samples: list[float] = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return percentiles(samples)
+
+
+def bench_stages(iterations: int, pdf_pages: int, tmpdir: str) -> dict:
+    raw = LABELLED_FORM.replace("\n", "\r\n") + "\n\n\n\n" + PROSE_FORM
+    text = normalize_text(raw)
+    fields = dict(CANNED_EXTRACT)
+
+    tools = ToolRegistry()
+    tools.register("noop", lambda **kw: None)
+
+    pdf_path = os.path.join(tmpdir, "package.pdf")
+    with open(pdf_path, "wb") as f:
+        f.write(transfer_package_pdf(attachment_pages=pdf_pages - 1))
+
+    state = {"fields": fields, "validation": validate_fields(fields, text), "review": {}, "path": "READY_FOR_HUMAN_APPROVAL"}
+    counter = iter(range(10**9))
+
+    return {
+        "normalize_text": time_calls(lambda: normalize_text(raw), iterations),
+        "validate_fields": time_calls(lambda: validate_fields(fields, text), iterations),
+        "tool_registry_execute": time_calls(lambda: tools.execute("noop", x=1), iterations),
+        "extract_text_from_pdf": time_calls(lambda: extract_text_from_pdf(pdf_path), max(3, iterations // 200)),
+        "db_save_case": time_calls(
+            lambda: db.save_case(f"bench-{next(counter)}", "Bench", text, state), max(10, iterations // 10)
+        ),
+    }
+
+
+def bench_end_to_end(cases: int, concurrency: int, llm: FakeLLMClient, prose_ratio: float,
+                     review_mode: str = "separate", cascade: CascadePolicy | None = None) -> dict:
+    """
+    Run `cases` documents through TransferAgent on `concurrency` threads.
+    `prose_ratio` of them are unlabelled and need the (fake) LLM for extraction.
+    `review_mode` is passed to TransferAgent (see workflow.REVIEW_MODES); `cascade`
+    runs extraction through a model cascade.
+    """
+    n_prose = int(round(cases * prose_ratio))
+    docs = [normalize_text(PROSE_FORM if i < n_prose else LABELLED_FORM) for i in range(cases)]
+    latencies: list[float] = []
+    metrics = ToolMetrics(window=cases)
+
+    def one(text: str) -> None:
+        t0 = time.perf_counter()
+        router, _ = build_router(llm, metrics=metrics, cascade=cascade)
+        router.route({"document_text": text, "review_mode": review_mode})
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, docs))
+    wall = time.perf_counter() - t0
+
+    out = percentiles(latencies)
+    out["concurrency"] = concurrency
+    out["wall_s"] = wall
+    out["cases_per_s"] = cases / wall if wall > 0 else 0.0
+    out["tools"] = {
+        tool: {k: s[k] for k in ("calls", "errors", "p50_ms", "p90_ms", "p99_ms")}
+        for tool, s in metrics.snapshot().items()
+    }
+    return out
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(new: dict, old: dict, out=sys.stdout) -> None:
+    """
+    Print p50/p99 and throughput deltas between two result files.
+    """
+    print(f"\nCompare {old['meta'].get('commit')} -> {new['meta'].get('commit')}", file=out)
+    for name, stats in new["stages"].items():
+        prev = old.get("stages", {}).get(name)
+        if prev and prev.get("n"):
+            print(f"  {name:24s} p50 {prev['p50_ms']:9.3f} -> {stats['p50_ms']:9.3f} ms"
+                  f"   p99 {prev['p99_ms']:9.3f} -> {stats['p99_ms']:9.3f} ms", file=out)
+    for key, stats in new["end_to_end"].items():
+        prev = old.get("end_to_end", {}).get(key)
+        if prev:
+            print(f"  e2e c={key:<4s} {prev['cases_per_s']:9.1f} -> {stats['cases_per_s']:9.1f} cases/s"
+                  f"   p99 {prev['p99_ms']:9.1f} -> {stats['p99_ms']:9.1f} ms", file=out)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the transfer pipeline with a fake LLM.")
+    parser.add_argument("--iterations", type=int, default=2000, help="iterations for micro-benchmarks")
+    parser.add_argument("--cases", type=int, default=200, help="cases per end-to-end run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0, help="simulated LLM latency per call")
+    parser.add_argument("--llm-jitter-ms", type=float, default=0.0, help="extra uniform random latency")
+    parser.add_argument("--prose-ratio", type=float, default=0.5,
+                        help="share of documents without labelled fields (these need the LLM to extract)")
+    parser.add_argument("--review-mode", choices=REVIEW_MODES, default="separate",
+                        help="one or two LLM calls per case (auto picks per case)")
+    parser.add_argument("--cascade", action="store_true",
+                        help="extract with a fast fake model (1/4 of the latency) before the default one")
+    parser.add_argument("--pdf-pages", type=int, default=10)
+    parser.add_argument("--out", help="write JSON results here")
+    parser.add_argument("--compare", help="previous JSON results to diff against")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db.DB_PATH = os.path.join(tmpdir, "bench_cases.db")
+        db.init_db()
+
+        stages = bench_stages(args.iterations, args.pdf_pages, tmpdir)
+        end_to_end = {}
+        for c in args.concurrency:
+            llm = FakeLLMClient(latency_s=args.llm_latency_ms / 1000, jitter_s=args.llm_jitter_ms / 1000,
+                                model_latency_s={"fake-fast": args.llm_latency_ms / 4000})
+            cascade = CascadePolicy(["fake-fast", llm.model]) if args.cascade else None
+            end_to_end[str(c)] = bench_end_to_end(args.cases, c, llm, args.prose_ratio, args.review_mode, cascade)
+
+    results = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "config": vars(args),
+        },
+        "stages": stages,
+        "end_to_end": end_to_end,
+    }
+
+    for name, s in stages.items():
+        print(f"{name:24s} n={s['n']:<6d} p50={s['p50_ms']:9.3f}ms  p90={s['p90_ms']:9.3f}ms  p99={s['p99_ms']:9.3f}ms")
+    for key, s in end_to_end.items():
+        print(f"e2e concurrency={key:<4s} {s['cases_per_s']:9.1f} cases/s  "
+              f"p50={s['p50_ms']:8.1f}ms  p99={s['p99_ms']:8.1f}ms")
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Quota benchmark: several worker processes share one provider quota, enforced by a local
+fake OpenAI server that answers 429 (with retry-after) above `--rpm-quota`.
+
+Each mode runs the same calls from `--processes` processes x `--threads` threads:
+- unlimited: every worker sends as fast as it can (retries honour retry-after)
+- limited:   shared SQLite TokenBucketLimiter at `--headroom` of the quota, plus
+             AIMD adaptive concurrency in each process
+Reported: completed/failed calls, 429s, and admitted requests per second (mean and
+spread over the run, after the first second) against the quota - steady at the
+ceiling is the goal.
+
+Usage:
+    python -m benchmarks.bench_rate_limit
+    python -m benchmarks.bench_rate_limit --rpm-quota 1200 --processes 4 --threads 8 --calls 400
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from core.llm_client import LLMClient
+from core.rate_limiter import TokenBucketLimiter
+
+from benchmarks.bench_hedging import MESSAGES
+from benchmarks.fake_openai_server import FakeOpenAIServer
+
+
+def worker(calls: int, threads: int, limiter_path: str | None, rpm: float | None, adaptive: bool) -> dict:
+    limiter = TokenBucketLimiter(limiter_path, requests_per_min=rpm, name="bench") if limiter_path else None
+    llm = LLMClient(cache=None, max_concurrency=threads, rate_limiter=limiter, adaptive_concurrency=adaptive)
+    outcomes = {"ok": 0, "failed": 0}
+
+    def one(_: int) -> str:
+        try:
+            llm.chat(MESSAGES, temperature=0.1, json_mode=True)
+            return "ok"
+        except Exception:
+            return "failed"
+
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for outcome in pool.map(one, range(calls)):
+                outcomes[outcome] += 1
+    finally:
+        llm.close()
+    return outcomes
+
+
+def throughput(admitted: list[float], quota_per_s: float) -> dict:
+    """
+    Admitted requests per whole second of the run, skipping the first second (the
+    quota's initial burst allowance) and the partial last one.
+    """
+    if len(admitted) < 2:
+        return {"per_s_mean": 0.0, "per_s_stdev": 0.0, "of_quota": 0.0}
+    start = admitted[0] + 1
+    seconds = max(1, math.floor(admitted[-1] - start))
+    buckets = [0] * seconds
+    for t in admitted:
+        i = math.floor(t - start)
+        if 0 <= i < seconds:
+            buckets[i] += 1
+    mean = statistics.mean(buckets)
+    return {
+        "per_s_mean": round(mean, 2),
+        "per_s_stdev": round(statistics.pstdev(buckets), 2),
+        "of_quota": round(mean / quota_per_s, 3),
+    }
+
+
+def run_mode(args, *, limited: bool, tmpdir: str) -> dict:
+    server = FakeOpenAIServer(latency_ms=args.latency_ms, rpm_quota=args.rpm_quota).start()
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+    limiter_path = os.path.join(tmpdir, "limiter.db") if limited else None
+    rpm = args.rpm_quota * args.headroom if limited else None
+    per_process = args.calls // args.processes
+    t0 = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.processes) as pool:
+            futures = [pool.submit(worker, per_process, args.threads, limiter_path, rpm, limited)
+                       for _ in range(args.processes)]
+            results = [f.result() for f in futures]
+    finally:
+        server.shutdown()
+    wall = time.perf_counter() - t0
+    out = {
+        "ok": sum(r["ok"] for r in results),
+        "failed": sum(r["failed"] for r in results),
+        "429": server.stats["429"],
+        "wall_s": round(wall, 2),
+    }
+    out.update(throughput(server.admitted, args.rpm_quota / 60))
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Shared-quota benchmark against a fake OpenAI server.")
+    parser.add_argument("--rpm-quota", type=float, default=1200.0, help="server-side requests/min quota")
+    parser.add_argument("--headroom", type=float, default=0.95, help="limiter budget as a fraction of the quota")
+    parser.add_argument("--processes", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=8, help="threads (and max in-flight) per process")
+    parser.add_argument("--calls", type=int, default=300, help="calls across all processes")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--out", help="write JSON results here")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for label, limited in (("unlimited", False), ("limited", True)):
+            results[label] = run_mode(args, limited=limited, tmpdir=tmpdir)
+
+    for label, r in results.items():
+        print(f"{label:10s} ok={r['ok']:<5d} failed={r['failed']:<4d} 429s={r['429']:<5d} wall={r['wall_s']:6.1f}s  "
+              f"admitted/s={r['per_s_mean']:6.2f} (sd {r['per_s_stdev']:.2f}, {r['of_quota']:.0%} of quota)")
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+    return 0 if results["limited"]["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Startup-time budget for the CLI/worker entry points.
+
+Each entry module is imported in a fresh interpreter (as `python -m ...` would), several
+times; the median time of the import itself is compared with the budget, and heavy
+dependencies that must stay lazy (pdfplumber, openai, httpx, pandas) must not be loaded
+by the import alone. Exits non-zero on any breach, so it can gate CI.
+
+Usage:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --budget-ms 150 --runs 7 --out bench/startup.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ENTRY_POINTS = [
+    "products.transfer_orchestrator.worker",
+    "products.transfer_orchestrator.batch",
+    "products.transfer_orchestrator.revalidate",
+    "products.transfer_orchestrator.archive",
+    "products.transfer_orchestrator.replay",
+]
+
+# must only load on the code path that needs them
+LAZY_MODULES = ["pdfplumber", "pdfminer", "openai", "httpx", "pandas", "numpy", "dotenv"]
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t0
+print(json.dumps([elapsed, sorted(m for m in {lazy!r} if m in sys.modules)]))
+"""
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code: str) -> str:
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=REPO_ROOT)
+    return out.stdout
+
+
+def measure(module: str, runs: int) -> dict:
+    samples: list[float] = []
+    loaded: list[str] = []
+    for _ in range(runs):
+        elapsed, loaded = json.loads(_run(_PROBE.format(module=module, lazy=LAZY_MODULES)))
+        samples.append(elapsed * 1000)
+    return {
+        "median_ms": round(statistics.median(samples), 1),
+        "max_ms": round(max(samples), 1),
+        "eagerly_loaded": loaded,
+    }
+
+
+def check(budget_ms: float, runs: int, modules: list[str] = ENTRY_POINTS) -> dict:
+    results = {m: measure(m, runs) for m in modules}
+    failures = []
+    for module, r in results.items():
+        if r["median_ms"] > budget_ms:
+            failures.append(f"{module}: import took {r['median_ms']}ms (budget {budget_ms}ms)")
+        if r["eagerly_loaded"]:
+            failures.append(f"{module}: imports {', '.join(r['eagerly_loaded'])} at startup")
+    return {"budget_ms": budget_ms, "runs": runs, "entry_points": results, "failures": failures}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check entry-point import time against a budget.")
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="max median import time per entry point")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per entry point")
+    parser.add_argument("--out", help="write JSON results here")
+    args = parser.parse_args(argv)
+
+    report = check(args.budget_ms, args.runs)
+    for module, r in report["entry_points"].items():
+        print(f"{module:45s} median={r['median_ms']:7.1f}ms  max={r['max_ms']:7.1f}ms")
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    for failure in report["failures"]:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+
+from products.transfer_orchestrator.prompts import COMBINED_SYSTEM, EXTRACT_SYSTEM, REVIEW_SYSTEM
+
+CANNED_EXTRACT = {
+    "client_full_name": "Jane Doe",
+    "client_email": "jane.doe@example.com",
+    "client_phone": "(416) 555-0199",
+    "sending_institution": "RBC Direct Investing",
+    "receiving_institution": "Wealthsimple",
+    "transfer_type": "FULL",
+    "transfer_method": "IN_KIND",
+    "account_type": "TFSA",
+    "account_number_last4": "1234",
+    "requested_date": "2024-05-01",
+    "has_signature": True,
+}
+
+CANNED_REVIEW = {
+    "case_summary": "Full TFSA transfer from RBC Direct Investing to Wealthsimple.",
+    "checklist": ["Verify client identity", "Confirm signature"],
+    "recommended_next_step": "READY_FOR_HUMAN_APPROVAL",
+    "customer_message_draft": "Hi Jane, we have received your transfer request.",
+    "internal_note": "All required fields present.",
+    "human_must_decide": {"decision": "APPROVE_TO_PROCEED", "why": "Checks passed."},
+}
+
+
+class FakeLLMClient:
+    """
+    Deterministic stand-in for LLMClient: same `chat` contract, canned JSON, and a
+    configurable simulated latency (sleep, so it overlaps across threads like real I/O).
+    Calls with a `model` override can get their own latency and extraction result
+    (`model_latency_s`, `extract_by_model`), to exercise a model cascade.
+    """
+
+    def __init__(self, *, latency_s: float = 0.0, jitter_s: float = 0.0, seed: int = 0,
+                 extract: dict | None = None, review: dict | None = None,
+                 model_latency_s: dict[str, float] | None = None,
+                 extract_by_model: dict[str, dict] | None = None):
+        self.model = "fake-llm"
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self._extract = json.dumps(extract or CANNED_EXTRACT)
+        self._review = json.dumps(review or CANNED_REVIEW)
+        self._combined = json.dumps({
+            "fields": extract or CANNED_EXTRACT,
+            "review": {"assumed_status": "PASS", **(review or CANNED_REVIEW)},
+        })
+        self.model_latency_s = dict(model_latency_s or {})
+        self._extract_by_model = {m: json.dumps(f) for m, f in (extract_by_model or {}).items()}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.calls_by_model: Counter = Counter()
+
+    def _delay(self, model: str) -> float:
+        with self._lock:
+            self.calls += 1
+            self.calls_by_model[model] += 1
+            jitter = self._rng.uniform(0, self.jitter_s) if self.jitter_s else 0.0
+        return self.model_latency_s.get(model, self.latency_s) + jitter
+
+    def chat(self, messages, *, temperature: float = 0.2, json_mode: bool = False,
+             model: str | None = None) -> str:
+        model = model or self.model
+        delay = self._delay(model)
+        if delay > 0:
+            time.sleep(delay)
+        system = messages[0]["content"] if messages else ""
+        if system == EXTRACT_SYSTEM:
+            return self._extract_by_model.get(model, self._extract)
+        if system == REVIEW_SYSTEM:
+            return self._review
+        if system == COMBINED_SYSTEM:
+            return self._combined
+        return "{}"
@@ -0,0 +1,167 @@
+"""
+Local stand-in for the OpenAI chat completions endpoint, for exercising the real
+LLMClient (HTTP pool, retries, deadlines, hedging) without an API key or network.
+
+Responses are FakeLLMClient's canned JSON; latency is `latency_ms` plus, for a
+`slow_ratio` fraction of requests, `slow_ms` more (the slow tail to cut). With
+`rpm_quota` the server enforces a provider-style quota (token bucket, one second of
+burst) and answers 429 with retry-after headers past it; `error_ratio` injects 503s.
+Point the client at it with OPENAI_BASE_URL=<server.base_url> and any OPENAI_API_KEY.
+
+Usage:
+    python -m benchmarks.fake_openai_server --port 8765 --latency-ms 50 --slow-ratio 0.05 --slow-ms 2000
+    python -m benchmarks.fake_openai_server --port 8765 --rpm-quota 600 --error-ratio 0.01
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fake_llm import FakeLLMClient
+
+
+class FakeOpenAIServer:
+    def __init__(self, *, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 50.0,
+                 slow_ratio: float = 0.0, slow_ms: float = 2000.0, rpm_quota: float | None = None,
+                 error_ratio: float = 0.0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.slow_ratio = slow_ratio
+        self.slow_ms = slow_ms
+        self.rate = rpm_quota / 60 if rpm_quota else None
+        self.error_ratio = error_ratio
+        self._allowance = self.rate or 0.0
+        self._allowance_at = time.monotonic()
+        # monotonic times of requests admitted under the quota (throughput over time)
+        self.admitted: list[float] = []
+        self.llm = FakeLLMClient()
+        self.stats: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _admit(self) -> tuple[int, float]:
+        """
+        (status, retry_after_s) for a new request: 429 over the quota, 503 at `error_ratio`.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self.rate:
+                self._allowance = min(self.rate, self._allowance + (now - self._allowance_at) * self.rate)
+                self._allowance_at = now
+                if self._allowance < 1:
+                    self.stats["429"] += 1
+                    return 429, (1 - self._allowance) / self.rate
+                self._allowance -= 1
+            if self._rng.random() < self.error_ratio:
+                self.stats["503"] += 1
+                return 503, 0.0
+            self.admitted.append(now)
+        return 200, 0.0
+
+    def _delay_s(self) -> float:
+        with self._lock:
+            self.stats["requests"] += 1
+            slow = self._rng.random() < self.slow_ratio
+            if slow:
+                self.stats["slow"] += 1
+        return (self.latency_ms + (self.slow_ms if slow else 0.0)) / 1000
+
+    def _completion(self, request: dict) -> dict:
+        content = self.llm.chat(request.get("messages") or [], json_mode=bool(request.get("response_format")))
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model") or "fake-llm",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if not self.path.endswith("/chat/completions"):
+                    self.send_error(404)
+                    return
+                status, retry_after = server._admit()
+                if status != 200:
+                    data = json.dumps({"error": {"message": "Rate limit reached" if status == 429 else "Overloaded",
+                                                 "type": "rate_limit_exceeded" if status == 429 else "server_error"}})
+                    self.send_response(status)
+                    if status == 429:
+                        self.send_header("retry-after-ms", str(int(retry_after * 1000) + 1))
+                        self.send_header("retry-after", str(max(1, round(retry_after))))
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data.encode("utf-8"))
+                    return
+                time.sleep(server._delay_s())
+                data = json.dumps(server._completion(request)).encode("utf-8")
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # the client gave up (deadline, or a hedge won)
+                    with server._lock:
+                        server.stats["abandoned"] += 1
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeOpenAIServer":
+        threading.Thread(target=self._server.serve_forever, name="fake-openai", daemon=True).start()
+        return self
+
+    def shutdown(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve fake OpenAI chat completions locally.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--slow-ratio", type=float, default=0.0, help="fraction of requests given --slow-ms extra")
+    parser.add_argument("--slow-ms", type=float, default=2000.0)
+    parser.add_argument("--rpm-quota", type=float, help="answer 429 above this many requests/min")
+    parser.add_argument("--error-ratio", type=float, default=0.0, help="fraction of requests answered 503")
+    args = parser.parse_args(argv)
+    server = FakeOpenAIServer(port=args.port, latency_ms=args.latency_ms, slow_ratio=args.slow_ratio,
+                              slow_ms=args.slow_ms, rpm_quota=args.rpm_quota, error_ratio=args.error_ratio).start()
+    print(f"OPENAI_BASE_URL={server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+LABELLED_FORM = """TRANSFER AUTHORIZATION FORM
+Client Name: Jane Doe
+Email: jane.doe@example.com
+Phone: (416) 555-0199
+Sending Institution: RBC Direct Investing
+Receiving Institution: Wealthsimple
+Transfer Type: Full
+Account Type: TFSA
+Last 4: 1234
+Requested Date: 2024-05-01
+Signature: Present
+"""
+
+# Prose form: no labelled lines, so extraction always needs the LLM.
+PROSE_FORM = """Request to transfer assets
+
+I, Jane Doe, ask that my tax-free savings account held at RBC Direct Investing
+(account ending 1234) be moved in full to Wealthsimple, in kind, on or after
+May 1st 2024. You can reach me at jane.doe@example.com or (416) 555-0199.
+
+Signed by client.
+"""
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: list[list[str]]) -> bytes:
+    """
+    Minimal text-based PDF (Helvetica, one text block per page) so PDF extraction can be
+    benchmarked without binary fixtures or extra dependencies.
+    """
+    objs = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "",  # page tree, filled once page ids are known
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids: list[int] = []
+    for lines in pages:
+        body = "BT /F1 11 Tf 72 740 Td 14 TL " + " ".join(f"({_pdf_escape(l)}) Tj T*" for l in lines) + " ET"
+        objs.append(f"<< /Length {len(body)} >>\nstream\n{body}\nendstream")
+        objs.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objs)} 0 R >>"
+        )
+        kids.append(len(objs))
+    objs[1] = f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets: list[int] = []
+    for i, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{o:010d} 00000 n \n".encode() for o in offsets)
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def transfer_package_pdf(attachment_pages: int = 10) -> bytes:
+    """
+    A transfer form on page 1 followed by `attachment_pages` statement pages.
+    """
+    form = [l for l in LABELLED_FORM.splitlines() if l]
+    statement = [f"2024-0{m % 9 + 1}-15  DIVIDEND  XIU  {m * 3.17:.2f}" for m in range(45)]
+    return make_pdf([form] + [statement] * attachment_pages)
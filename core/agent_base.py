@@ -1,6 +1,8 @@
 from __future__ import annotations
 from typing import Any
 
+from core.step_graph import Step, StepGraph
+
 class AgentBase:
     def __init__(self, llm_client, tool_registry, state_manager):
         self.llm = llm_client
@@ -9,3 +11,19 @@ class AgentBase:
 
     def run(self, input_payload: Any) -> dict:
         raise NotImplementedError("Agent must implement run()")
+
+    def tool_step(self, tool_name: str, *, inputs, outputs, name: str | None = None,
+                  checkpoint: bool = False) -> Step:
+        """
+        Graph step that invokes a registered tool (so it is logged/timed by the registry).
+        """
+        return Step(name or tool_name, lambda **kw: self.tools.execute(tool_name, **kw),
+                    inputs=inputs, outputs=outputs, checkpoint=checkpoint)
+
+    def run_graph(self, graph: StepGraph, *, inputs: dict | None = None, max_workers: int = 4,
+                  checkpoints=None) -> dict:
+        """
+        Execute a StepGraph against this agent's state and return the snapshot.
+        """
+        graph.run(self.state, inputs=inputs, max_workers=max_workers, checkpoints=checkpoints)
+        return self.state.snapshot()
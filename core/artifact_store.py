@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Iterable, Optional
+
+ARTIFACT_PATH = os.path.join("data", "artifacts.db")
+
+REF_PREFIX = "sha256:"
+
+
+class ArtifactStore:
+    """
+    Content-addressed, compressed blob store on SQLite (document text, large outputs).
+    - put: zlib-compress and store under "sha256:<hex of the raw bytes>"; storing the
+      same content again only refreshes its `created_at`, so re-uploads and re-runs are
+      deduplicated and a blob just handed out is never "old"
+    - get / get_text: look up by ref
+    Callers keep the (short) ref instead of a copy of the content.
+    Safe to share between threads and processes (each process opens its own connection).
+    """
+
+    def __init__(self, path: str | None = None, *, level: int = 6):
+        self.path = path or os.getenv("ARTIFACT_STORE_PATH") or ARTIFACT_PATH
+        self.level = level
+        self._local = threading.local()
+        with self._conn() as con:
+            con.execute("""
+            CREATE TABLE IF NOT EXISTS artifacts (
+                ref TEXT PRIMARY KEY,
+                size INTEGER,
+                stored_size INTEGER,
+                data BLOB,
+                created_at REAL
+            )
+            """)
+
+    def _conn(self) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        if con is not None and self._local.pid == os.getpid():
+            return con
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        con = sqlite3.connect(self.path, timeout=30)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA busy_timeout=30000")
+        self._local.con, self._local.pid = con, os.getpid()
+        return con
+
+    @staticmethod
+    def _bytes(data: str | bytes) -> bytes:
+        return data.encode("utf-8") if isinstance(data, str) else data
+
+    @staticmethod
+    def ref(data: str | bytes) -> str:
+        """
+        The ref `data` is (or would be) stored under; no I/O.
+        """
+        return REF_PREFIX + hashlib.sha256(ArtifactStore._bytes(data)).hexdigest()
+
+    def put(self, data: str | bytes) -> str:
+        return self.put_many([data])[0]
+
+    def put_many(self, items: Iterable[str | bytes], *, con: sqlite3.Connection | None = None) -> list[str]:
+        """
+        Store several blobs in one transaction; returns their refs in order.
+        With `con` (a connection to the same database file) the rows are written in the
+        caller's open transaction and not committed here.
+        """
+        refs: list[str] = []
+        rows = {}
+        for item in items:
+            raw = self._bytes(item)
+            ref = self.ref(raw)
+            refs.append(ref)
+            rows.setdefault(ref, raw)
+        if not rows:
+            return refs
+        own = con is None
+        con = con or self._conn()
+        known = self._existing(con, list(rows))
+        now = time.time()
+        if known:
+            con.executemany("UPDATE artifacts SET created_at=? WHERE ref=?", [(now, ref) for ref in known])
+        params = []
+        for ref, raw in rows.items():
+            if ref in known:
+                continue
+            packed = zlib.compress(raw, self.level)
+            params.append((ref, len(raw), len(packed), packed, now))
+        if params:
+            con.executemany("INSERT OR IGNORE INTO artifacts VALUES(?,?,?,?,?)", params)
+        if own:
+            con.commit()
+        return refs
+
+    def delete(self, refs: Iterable[str], *, con: sqlite3.Connection | None = None,
+               stored_before: float | None = None) -> int:
+        """
+        Remove blobs (callers decide what is unreferenced). `con` as in put_many.
+        With `stored_before` (a time.time() value), blobs put since then are kept.
+        """
+        refs = list(refs)
+        own = con is None
+        con = con or self._conn()
+        deleted = 0
+        for i in range(0, len(refs), 500):
+            chunk = refs[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            if stored_before is None:
+                deleted += con.execute(f"DELETE FROM artifacts WHERE ref IN ({marks})", chunk).rowcount
+            else:
+                deleted += con.execute(
+                    f"DELETE FROM artifacts WHERE ref IN ({marks}) AND created_at<?", [*chunk, stored_before]
+                ).rowcount
+        if own:
+            con.commit()
+        return deleted
+
+    @staticmethod
+    def _existing(con: sqlite3.Connection, refs: list[str]) -> set[str]:
+        found: set[str] = set()
+        for i in range(0, len(refs), 500):
+            chunk = refs[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(r for (r,) in con.execute(f"SELECT ref FROM artifacts WHERE ref IN ({marks})", chunk))
+        return found
+
+    def get(self, ref: str) -> Optional[bytes]:
+        row = self._conn().execute("SELECT data FROM artifacts WHERE ref=?", (ref,)).fetchone()
+        return zlib.decompress(row[0]) if row else None
+
+    def get_text(self, ref: str) -> Optional[str]:
+        raw = self.get(ref)
+        return raw.decode("utf-8") if raw is not None else None
+
+    def get_many_text(self, refs: Iterable[str]) -> dict[str, str]:
+        """
+        {ref: text} for the refs that exist (one query per 500 refs).
+        """
+        refs = list(dict.fromkeys(r for r in refs if r))
+        out: dict[str, str] = {}
+        con = self._conn()
+        for i in range(0, len(refs), 500):
+            chunk = refs[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for ref, data in con.execute(f"SELECT ref, data FROM artifacts WHERE ref IN ({marks})", chunk):
+                out[ref] = zlib.decompress(data).decode("utf-8")
+        return out
+
+    def stats(self) -> dict:
+        count, size, stored = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM artifacts"
+        ).fetchone()
+        return {
+            "artifacts": count,
+            "bytes": size,
+            "stored_bytes": stored,
+            "compression_ratio": round(size / stored, 2) if stored else None,
+        }
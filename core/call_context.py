@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Ambient per-call context. StepGraph copies the context into its pool threads, so values
+# bound around `MCPRouter.route` / `ToolRegistry.execute` (case, tool, deadline) are
+# visible to the LLM client.
+case_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("case_id", default=None)
+tool_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("tool", default=None)
+
+
+@contextmanager
+def bind(var: contextvars.ContextVar, value) -> Iterator[None]:
+    token = var.set(value)
+    try:
+        yield
+    finally:
+        var.reset(token)
+
+
+# Absolute time.monotonic() by which the current call must finish, or None for no limit.
+deadline_var: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The call's deadline (see `deadline`) passed before it could complete."""
+
+
+def remaining(deadline_at: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds left until `deadline_at` (default: the bound deadline); None when unbounded.
+    Raises DeadlineExceeded once it has passed.
+    """
+    if deadline_at is None:
+        deadline_at = deadline_var.get()
+    if deadline_at is None:
+        return None
+    left = deadline_at - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded by {-left:.3f}s")
+    return left
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bind a deadline `seconds` from now. Nested deadlines only ever tighten: an inner
+    scope cannot extend the time its caller has left. None leaves the current deadline.
+    """
+    if seconds is None:
+        yield
+        return
+    at = time.monotonic() + seconds
+    current = deadline_var.get()
+    with bind(deadline_var, at if current is None else min(at, current)):
+        yield
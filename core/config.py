@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import os
+
+_loaded: set[str] = set()
+
+
+def load_config(path: str = ".env", *, override: bool = False) -> bool:
+    """
+    Load settings from a dotenv file into os.environ. Called explicitly by entry
+    points (CLIs, workers, the app) instead of as a side effect of importing a module.
+    Variables already in the environment win unless `override`. Each path is read
+    at most once per process; returns True if the file was read.
+    """
+    key = os.path.abspath(path)
+    if key in _loaded and not override:
+        return False
+    _loaded.add(key)
+    if not os.path.exists(path):
+        return False
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path=path, override=override)
+    return True
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Optional
+
+QUEUE_PATH = os.path.join("data", "jobs.db")
+
+# queued -> leased -> done
+#                  -> queued (retry, after backoff)   -> ... -> dead (max_attempts reached)
+#                  -> queued (fresh attempts: re-enqueued while leased, see `rerun`)
+JOB_STATUSES = ("queued", "leased", "done", "dead")
+
+
+class JobQueue:
+    """
+    Durable local job queue on SQLite (stand-in for Redis):
+    - enqueue: persist a JSON payload
+    - lease: atomically claim the oldest available job for `lease_s` seconds;
+      a worker that dies simply lets the lease expire and the job is re-leased
+    - complete / fail: fail retries with exponential backoff, then dead-letters; both
+      only apply while the caller still holds the lease
+    - heartbeat: extend a lease while a long job runs
+    Safe to share between threads and processes (each process opens its own connection).
+    """
+
+    def __init__(self, path: str | None = None, *, queue: str = "default",
+                 max_attempts: int = 3, lease_s: float = 300.0, retry_base_s: float = 5.0):
+        self.path = path or os.getenv("JOB_QUEUE_PATH") or QUEUE_PATH
+        self.queue = queue
+        self.max_attempts = max_attempts
+        self.lease_s = lease_s
+        self.retry_base_s = retry_base_s
+        self._local = threading.local()
+        with self._conn() as con:
+            con.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                queue TEXT,
+                status TEXT,
+                payload_json TEXT,
+                result_json TEXT,
+                error TEXT,
+                attempts INTEGER DEFAULT 0,
+                max_attempts INTEGER,
+                available_at REAL,
+                lease_owner TEXT,
+                lease_expires_at REAL,
+                created_at REAL,
+                updated_at REAL,
+                rerun INTEGER DEFAULT 0
+            )
+            """)
+            cols = {r[1] for r in con.execute("PRAGMA table_info(jobs)").fetchall()}
+            if "rerun" not in cols:
+                con.execute("ALTER TABLE jobs ADD COLUMN rerun INTEGER DEFAULT 0")
+            con.execute("CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(queue, status, available_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        if con is not None and self._local.pid == os.getpid():
+            return con
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # autocommit mode: transactions are explicit (BEGIN IMMEDIATE) where atomicity matters
+        con = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        con.row_factory = sqlite3.Row
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA busy_timeout=30000")
+        self._local.con, self._local.pid = con, os.getpid()
+        return con
+
+    def enqueue(self, payload: Any, *, job_id: str | None = None, delay_s: float = 0.0) -> str:
+        """
+        Add a job. Re-enqueueing an existing job_id resets it to queued with the new payload;
+        if it is currently leased, the running attempt keeps its lease and the job is
+        flagged to run again (with the new payload) once that attempt completes or fails.
+        """
+        job_id = job_id or uuid.uuid4().hex
+        now = time.time()
+        self._conn().execute("""
+            INSERT INTO jobs(job_id, queue, status, payload_json, attempts, max_attempts,
+                             available_at, created_at, updated_at, rerun)
+            VALUES(?,?,'queued',?,0,?,?,?,?,0)
+            ON CONFLICT(job_id) DO UPDATE SET
+                payload_json=excluded.payload_json, updated_at=excluded.updated_at,
+                rerun=CASE WHEN status='leased' THEN 1 ELSE 0 END,
+                result_json=CASE WHEN status='leased' THEN result_json ELSE NULL END,
+                error=CASE WHEN status='leased' THEN error ELSE NULL END,
+                attempts=CASE WHEN status='leased' THEN attempts ELSE 0 END,
+                available_at=CASE WHEN status='leased' THEN available_at ELSE excluded.available_at END,
+                lease_owner=CASE WHEN status='leased' THEN lease_owner ELSE NULL END,
+                lease_expires_at=CASE WHEN status='leased' THEN lease_expires_at ELSE NULL END,
+                status=CASE WHEN status='leased' THEN 'leased' ELSE 'queued' END
+        """, (job_id, self.queue, json.dumps(payload), self.max_attempts, now + delay_s, now, now))
+        return job_id
+
+    def lease(self, worker_id: str, *, lease_s: float | None = None) -> Optional[dict]:
+        """
+        Claim the next ready job (or one whose lease expired). Returns the job with its
+        decoded `payload`, or None when nothing is ready.
+        """
+        now = time.time()
+        con = self._conn()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            # expired leases that already used every attempt go straight to dead-letter
+            con.execute("""
+                UPDATE jobs SET status='dead', error=COALESCE(error, 'lease expired'), updated_at=?
+                WHERE queue=? AND status='leased' AND lease_expires_at<? AND attempts>=max_attempts
+            """, (now, self.queue, now))
+            row = con.execute("""
+                SELECT * FROM jobs
+                WHERE queue=? AND ((status='queued' AND available_at<=?) OR (status='leased' AND lease_expires_at<?))
+                ORDER BY available_at
+                LIMIT 1
+            """, (self.queue, now, now)).fetchone()
+            if row is None:
+                con.execute("COMMIT")
+                return None
+            con.execute("""
+                UPDATE jobs SET status='leased', attempts=attempts+1, lease_owner=?, lease_expires_at=?, updated_at=?,
+                                rerun=0
+                WHERE job_id=?
+            """, (worker_id, now + (lease_s or self.lease_s), now, row["job_id"]))
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        job = dict(row)
+        job["attempts"] += 1
+        job["status"] = "leased"
+        job["payload"] = json.loads(job["payload_json"])
+        return job
+
+    def heartbeat(self, job_id: str, worker_id: str, *, lease_s: float | None = None) -> bool:
+        """
+        Extend a lease held by `worker_id`. False if the lease was lost.
+        """
+        now = time.time()
+        cur = self._conn().execute("""
+            UPDATE jobs SET lease_expires_at=?, updated_at=?
+            WHERE job_id=? AND status='leased' AND lease_owner=?
+        """, (now + (lease_s or self.lease_s), now, job_id, worker_id))
+        return cur.rowcount == 1
+
+    def _held(self, con: sqlite3.Connection, job_id: str, worker_id: str) -> Optional[sqlite3.Row]:
+        return con.execute(
+            "SELECT attempts, max_attempts, rerun FROM jobs WHERE job_id=? AND status='leased' AND lease_owner=?",
+            (job_id, worker_id),
+        ).fetchone()
+
+    def _requeue_fresh(self, con: sqlite3.Connection, job_id: str, now: float) -> None:
+        # re-enqueued while leased: run the new payload with a full set of attempts
+        con.execute("""
+            UPDATE jobs SET status='queued', attempts=0, rerun=0, result_json=NULL, error=NULL, available_at=?,
+                            lease_owner=NULL, lease_expires_at=NULL, updated_at=?
+            WHERE job_id=?
+        """, (now, now, job_id))
+
+    def complete(self, job_id: str, result: Any = None, *, worker_id: str) -> bool:
+        """
+        Mark the job done - or queued again if it was re-enqueued meanwhile. Returns False,
+        changing nothing, if `worker_id` no longer holds the lease (it expired and the job
+        was re-leased, or was re-run elsewhere).
+        """
+        con = self._conn()
+        now = time.time()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._held(con, job_id, worker_id)
+            if row is None:
+                con.execute("COMMIT")
+                return False
+            if row["rerun"]:
+                self._requeue_fresh(con, job_id, now)
+            else:
+                con.execute("""
+                    UPDATE jobs SET status='done', result_json=?, error=NULL, lease_owner=NULL,
+                                    lease_expires_at=NULL, updated_at=?
+                    WHERE job_id=?
+                """, (json.dumps(result), now, job_id))
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        return True
+
+    def fail(self, job_id: str, error: str, *, worker_id: str) -> Optional[str]:
+        """
+        Record a failed attempt: re-queue with exponential backoff, or dead-letter once
+        attempts are exhausted (a job re-enqueued meanwhile is queued with fresh attempts).
+        Returns the new status, or None - changing nothing - if `worker_id` lost the lease.
+        """
+        con = self._conn()
+        now = time.time()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._held(con, job_id, worker_id)
+            if row is None:
+                con.execute("COMMIT")
+                return None
+            if row["rerun"]:
+                self._requeue_fresh(con, job_id, now)
+                status = "queued"
+            else:
+                if row["attempts"] >= row["max_attempts"]:
+                    status, available_at = "dead", now
+                else:
+                    status, available_at = "queued", now + self.retry_base_s * (2 ** (row["attempts"] - 1))
+                con.execute("""
+                    UPDATE jobs SET status=?, error=?, available_at=?, lease_owner=NULL, lease_expires_at=NULL,
+                                    updated_at=?
+                    WHERE job_id=?
+                """, (status, error, available_at, now, job_id))
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        return status
+
+    def requeue(self, job_id: str) -> None:
+        """
+        Give a dead-lettered job a fresh set of attempts.
+        """
+        now = time.time()
+        self._conn().execute("""
+            UPDATE jobs SET status='queued', attempts=0, available_at=?, updated_at=?
+            WHERE job_id=? AND status='dead'
+        """, (now, now, job_id))
+
+    def get(self, job_id: str) -> Optional[dict]:
+        row = self._conn().execute("SELECT * FROM jobs WHERE job_id=?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result_json"]) if job["result_json"] else None
+        return job
+
+    def unfinished_payloads(self) -> list[Any]:
+        """
+        Payloads of every job not done yet (queued, leased, or dead and so re-queueable).
+        """
+        cur = self._conn().execute(
+            "SELECT payload_json FROM jobs WHERE queue=? AND status!='done'", (self.queue,)
+        )
+        return [json.loads(r[0]) for r in cur.fetchall()]
+
+    def dead_letters(self, limit: int = 50) -> list[dict]:
+        cur = self._conn().execute("""
+            SELECT job_id, attempts, error, updated_at FROM jobs
+            WHERE queue=? AND status='dead' ORDER BY updated_at DESC LIMIT ?
+        """, (self.queue, limit))
+        return [dict(r) for r in cur.fetchall()]
+
+    def stats(self) -> dict:
+        cur = self._conn().execute(
+            "SELECT status, COUNT(*) FROM jobs WHERE queue=? GROUP BY status", (self.queue,)
+        )
+        counts = {s: 0 for s in JOB_STATUSES}
+        counts.update({r[0]: r[1] for r in cur.fetchall()})
+        return counts
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import glob
+import gzip
+import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import IO, Iterator
+
+from core.call_context import case_id_var, tool_var
+from core.llm_client import LLMCache
+
+
+class CassetteMiss(KeyError):
+    """A replayed request has no recorded response."""
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read_cassette(path: str) -> Iterator[dict]:
+    """
+    Entries of one cassette, or of every cassette matching a glob pattern. A gzip
+    cassette whose recorder died before closing it yields everything flushed so far.
+    """
+    paths = sorted(glob.glob(path)) if glob.has_magic(path) else [path]
+    for p in paths:
+        with _open(p, "r") as f:
+            try:
+                for line in f:
+                    if line.endswith("\n"):
+                        yield json.loads(line)
+            except EOFError:
+                continue
+
+
+class RecordingLLMClient:
+    """
+    Wraps an LLM client (anything with `chat`) and appends every request/response pair
+    to a cassette: JSON lines, gzip-compressed when the path ends in ".gz".
+    Each entry holds the request key (same as LLMCache.key), the case ID and tool bound in
+    core.call_context, and the response text - not the prompt, to keep cassettes small.
+    A "{pid}" in `path` is replaced by the process ID, so worker processes never share a file.
+    """
+
+    def __init__(self, inner, path: str):
+        self.inner = inner
+        self.path = path.replace("{pid}", str(os.getpid()))
+        self.model = getattr(inner, "model", None)
+        self.cache = getattr(inner, "cache", None)
+        self._lock = threading.Lock()
+        self._file = _open(self.path, "a")
+        self.recorded = 0
+
+    def chat(self, messages, *, temperature: float = 0.2, json_mode: bool = False,
+             model: str | None = None) -> str:
+        content = self.inner.chat(messages, temperature=temperature, json_mode=json_mode, model=model)
+        model = model or self.model
+        entry = {
+            "key": LLMCache.key(model, messages, temperature, json_mode),
+            "case_id": case_id_var.get(),
+            "tool": tool_var.get(),
+            "model": model,
+            "client_model": self.model,
+            "response": content,
+            "ts": round(time.time(), 3),
+        }
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.recorded += 1
+        return content
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        if hasattr(self.inner, "close"):
+            self.inner.close()
+
+
+class ReplayLLMClient:
+    """
+    Serves recorded responses instead of calling the API (no key or network needed).
+    Lookup is by exact request key; unless `strict`, a request whose prompt changed
+    falls back to the last response recorded for the same (case ID, tool, model) - or, failing
+    that, (case ID, tool) - so prompt or validation changes can be replayed against
+    production cases. Misses raise CassetteMiss.
+    `path` may be a glob (e.g. the per-process cassettes of a recorded worker pool).
+    """
+
+    def __init__(self, path: str, *, strict: bool = False, model: str | None = None):
+        self.path = path
+        self.strict = strict
+        self.cache = None
+        self._by_key: dict[str, str] = {}
+        self._by_case_tool: dict[tuple, str] = {}
+        models: Counter = Counter()
+        for entry in read_cassette(path):
+            self._by_key[entry["key"]] = entry["response"]
+            if entry.get("case_id") and entry.get("tool"):
+                self._by_case_tool[(entry["case_id"], entry["tool"])] = entry["response"]
+                self._by_case_tool[(entry["case_id"], entry["tool"], entry.get("model"))] = entry["response"]
+            models[entry.get("client_model", entry.get("model"))] += 1
+        # keys embed the model name, so replay under the client model that was recorded
+        # (calls with a per-call model override, e.g. cascade tiers, name theirs)
+        self.model = model or (models.most_common(1)[0][0] if models else os.getenv("OPENAI_MODEL", "gpt-4o-mini"))
+        self._lock = threading.Lock()
+        self.stats: Counter = Counter()
+
+    @property
+    def case_ids(self) -> list[str]:
+        return sorted({k[0] for k in self._by_case_tool})
+
+    def chat(self, messages, *, temperature: float = 0.2, json_mode: bool = False,
+             model: str | None = None) -> str:
+        key = LLMCache.key(model or self.model, messages, temperature, json_mode)
+        content = self._by_key.get(key)
+        outcome = "hits"
+        if content is None and not self.strict:
+            case_tool = (case_id_var.get(), tool_var.get())
+            content = self._by_case_tool.get(case_tool + (model or self.model,)) or self._by_case_tool.get(case_tool)
+            outcome = "fallbacks"
+        with self._lock:
+            self.stats[outcome if content is not None else "misses"] += 1
+        if content is None:
+            raise CassetteMiss(f"No recorded response for case={case_id_var.get()} tool={tool_var.get()}")
+        return content
+
+    def close(self) -> None:
+        pass
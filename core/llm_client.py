@@ -1,32 +1,449 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
-from dotenv import load_dotenv
-from openai import OpenAI
+import random
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
 
-# Load env deterministically from repo root
-load_dotenv(dotenv_path=".env")
+from core.call_context import DeadlineExceeded, deadline_var, remaining
+from core.metrics import LatencyHistogram
+from core.rate_limiter import AdaptiveConcurrency, TokenBucketLimiter
 
+# openai/httpx are imported when a client is built, not when this module is imported:
+# replay, cache-only and rules-only runs never pay for them. Settings come from the
+# environment; entry points load .env explicitly with core.config.load_config().
+
+
+def retryable_errors() -> tuple[type[BaseException], ...]:
+    """
+    Errors worth retrying: transient network failures, throttling and provider 5xx.
+    """
+    from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+    return (APIConnectionError, APITimeoutError, InternalServerError, RateLimitError)
+
+
+# tokens budgeted for the response until the provider reports actual usage
+COMPLETION_TOKENS_ESTIMATE = 512
+
+
+def estimate_request_tokens(messages) -> int:
+    """
+    Rough request size for the tokens/min budget (~4 characters per token).
+    """
+    chars = sum(len(str(m.get("content") or "")) for m in messages)
+    return chars // 4 + COMPLETION_TOKENS_ESTIMATE
+
+
+def retry_after_s(error: BaseException) -> float | None:
+    """
+    Provider-requested wait from a failed response's retry-after-ms / retry-after headers.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    for header, scale in (("retry-after-ms", 1000.0), ("retry-after", 1.0)):
+        try:
+            return min(60.0, float(headers[header]) / scale)
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+def _is_overload(error: BaseException) -> bool:
+    status = getattr(error, "status_code", None)
+    return status is not None and (status == 429 or status >= 500)
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = (os.getenv(name) or "").strip()
+    return int(raw) if raw else default
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.getenv(name) or "").strip()
+    return float(raw) if raw else default
+
+
+class LLMCache:
+    """
+    Persistent, content-addressed response cache (SQLite).
+    Key = sha256 of (model, messages, temperature, json_mode), so a byte-identical
+    request is served locally. Entries expire after `ttl_s`; the store is trimmed to
+    the `max_entries` most recently used rows.
+    """
+
+    def __init__(self, path: str | None = None, *, ttl_s: float | None = None, max_entries: int | None = None):
+        self.path = path or os.getenv("LLM_CACHE_PATH") or os.path.join("data", "llm_cache.db")
+        self.ttl_s = ttl_s if ttl_s is not None else _env_float("LLM_CACHE_TTL_S", 30 * 24 * 3600)
+        self.max_entries = max_entries or _env_int("LLM_CACHE_MAX_ENTRIES", 50_000)
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._con = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("""
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            key TEXT PRIMARY KEY,
+            response TEXT,
+            created_at REAL,
+            last_used_at REAL
+        )
+        """)
+        self._con.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used_at)")
+
+    @classmethod
+    def from_env(cls) -> "LLMCache | None":
+        """
+        Cache configured from env; LLM_CACHE=0 disables it.
+        """
+        if (os.getenv("LLM_CACHE") or "1").strip().lower() in {"0", "false", "no", "off"}:
+            return None
+        return cls()
+
+    @staticmethod
+    def key(model: str, messages, temperature: float, json_mode: bool) -> str:
+        payload = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature, "json_mode": json_mode},
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._con.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key=?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl_s and now - row[1] > self.ttl_s):
+                self.misses += 1
+                return None
+            self._con.execute("UPDATE llm_cache SET last_used_at=? WHERE key=?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._con.execute(
+                "INSERT OR REPLACE INTO llm_cache(key, response, created_at, last_used_at) VALUES(?,?,?,?)",
+                (key, response, now, now),
+            )
+            self._puts += 1
+            # amortize eviction instead of paying for it on every write
+            if self._puts % 100 == 1:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        if self.ttl_s:
+            self._con.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_s,))
+        self._con.execute("""
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._con.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "entries": entries,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._con.execute("DELETE FROM llm_cache")
+
+
+class AsyncLLMClient:
+    """
+    asyncio-native client:
+    - one pooled httpx connection pool (keep-alive, no TLS setup per call)
+    - bounded number of requests in flight
+    - retries with exponential backoff + jitter on transient errors
+    - optional LLMCache consulted before any network call
+    - per-call deadline (core.call_context) bounding queueing, requests and retries
+    - optional hedging: once a request has run longer than the `hedge_percentile` of
+      recent latencies, a duplicate is sent and the first response wins
+    - optional shared requests/tokens per minute budget (TokenBucketLimiter), paused for
+      everyone on a 429's retry-after
+    - optional AIMD in-flight limit below `max_concurrency` that halves on 429/5xx
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int | None = None,
+        max_retries: int | None = None,
+        timeout_s: float | None = None,
+        cache: LLMCache | None = None,
+        hedge_percentile: float | None = None,
+        hedge_min_samples: int | None = None,
+        rate_limiter: TokenBucketLimiter | None = None,
+        adaptive_concurrency: bool | None = None,
+    ):
+        import httpx
+        from openai import AsyncOpenAI
 
-class LLMClient:
-    def __init__(self):
         api_key = os.getenv("OPENAI_API_KEY", "").strip()
         if not api_key:
-            raise RuntimeError("Missing OPENAI_API_KEY in .env")
+            raise RuntimeError("Missing OPENAI_API_KEY (set it in the environment or in .env loaded via load_config)")
 
         self.model = (os.getenv("OPENAI_MODEL") or "gpt-4o-mini").strip()
-        self.client = OpenAI(api_key=api_key)
+        self.max_concurrency = max_concurrency or _env_int("OPENAI_MAX_CONCURRENCY", 8)
+        self.max_retries = max_retries if max_retries is not None else _env_int("OPENAI_MAX_RETRIES", 3)
+        self.timeout_s = timeout_s or _env_float("OPENAI_TIMEOUT_S", 60.0)
+        self.backoff_base_s = 0.5
+        self.backoff_max_s = 20.0
+        self.cache = cache
+        self.hedge_percentile = hedge_percentile or _env_float("OPENAI_HEDGE_PERCENTILE", 0.0) or None
+        self.hedge_min_samples = hedge_min_samples or _env_int("OPENAI_HEDGE_MIN_SAMPLES", 20)
+        # request latencies (the hedge threshold; a cancelled primary counts with its elapsed
+        # time, a lower bound) and hedging counters;
+        # only touched from this client's event loop
+        self.latency = LatencyHistogram(window=512)
+        self.hedge_stats: Counter = Counter()
+        self.rate_limiter = rate_limiter
+        if adaptive_concurrency is None:
+            flag = (os.getenv("OPENAI_ADAPTIVE_CONCURRENCY") or "0").strip().lower()
+            adaptive_concurrency = flag in {"1", "true", "yes", "on"}
+        self.concurrency = (
+            AdaptiveConcurrency(initial=max(1, self.max_concurrency // 2), maximum=self.max_concurrency)
+            if adaptive_concurrency else None
+        )
+
+        self._http = httpx.AsyncClient(
+            timeout=self.timeout_s,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+        # Retries are handled here so backoff and the in-flight cap compose correctly.
+        self.client = AsyncOpenAI(api_key=api_key, http_client=self._http, max_retries=0)
+        self._inflight = asyncio.Semaphore(self.max_concurrency)
+        self._retryable = retryable_errors()
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max_s, self.backoff_base_s * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def _hedge_delay_s(self) -> float | None:
+        if self.hedge_percentile is None or self.latency.count < self.hedge_min_samples:
+            return None
+        return self.latency.percentile(self.hedge_percentile) / 1000
+
+    async def _create(self, model: str, messages, temperature: float, json_mode: bool,
+                      deadline_at: float | None, *, primary: bool = True) -> str:
+        estimate = 0
+        if self.rate_limiter is not None:
+            estimate = estimate_request_tokens(messages)
+            # the limiter is SQLite under BEGIN IMMEDIATE (may wait on other processes): keep it off the loop
+            wait = await asyncio.to_thread(self.rate_limiter.reserve, estimate, max_wait_s=remaining(deadline_at))
+            if wait > 0:
+                await asyncio.sleep(wait)
+        async with self._inflight, self.concurrency or nullcontext():
+            start = time.perf_counter()
+            try:
+                resp = await self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    response_format={"type": "json_object"} if json_mode else None,
+                )
+            except asyncio.CancelledError:
+                # a primary cancelled because its hedge won (or the deadline passed) is a slow
+                # request: its latency is at least this, and leaving it out biases the threshold
+                # low. A cancelled hedge is not - it started late and its primary was recorded.
+                if primary:
+                    self.latency.observe((time.perf_counter() - start) * 1000)
+                raise
+            except self._retryable as e:
+                if _is_overload(e):
+                    if self.concurrency is not None:
+                        self.concurrency.on_overload()
+                    wait = retry_after_s(e)
+                    if wait and self.rate_limiter is not None:
+                        await asyncio.to_thread(self.rate_limiter.penalize, wait)
+                raise
+            self.latency.observe((time.perf_counter() - start) * 1000)
+            if self.concurrency is not None:
+                self.concurrency.on_success()
+        usage = getattr(resp, "usage", None)
+        if self.rate_limiter is not None and getattr(usage, "total_tokens", None):
+            await asyncio.to_thread(self.rate_limiter.refund, estimate - usage.total_tokens)
+        return resp.choices[0].message.content
+
+    async def _create_hedged(self, model: str, messages, temperature: float, json_mode: bool,
+                             deadline_at: float | None) -> str:
+        """
+        One attempt: the request, plus a hedge if it is slow. Returns the first successful
+        response and cancels the other; raises if every request failed or the deadline passed.
+        """
+        def start(primary: bool = True) -> asyncio.Task:
+            return asyncio.ensure_future(
+                self._create(model, messages, temperature, json_mode, deadline_at, primary=primary)
+            )
+
+        primary = start()
+        pending = {primary}
+        try:
+            hedge_after = self._hedge_delay_s()
+            left = remaining(deadline_at)
+            if hedge_after is not None and (left is None or hedge_after < left):
+                done, pending = await asyncio.wait(pending, timeout=hedge_after)
+                if not done:
+                    self.hedge_stats["fired"] += 1
+                    pending.add(start(primary=False))
+                else:
+                    pending = done
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining(deadline_at), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise DeadlineExceeded("Deadline exceeded waiting for the LLM response")
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_stats["won"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def chat(self, messages, *, temperature: float = 0.2, json_mode: bool = False,
+                   model: str | None = None, deadline_at: float | None = None) -> str:
+        """
+        Same contract as LLMClient.chat, awaitable. `deadline_at` (a time.monotonic() value;
+        default: the deadline bound in core.call_context) bounds the whole call, retries
+        included: DeadlineExceeded is raised instead of waiting past it.
+        """
+        model = model or self.model
+        if deadline_at is None:
+            deadline_at = deadline_var.get()
+        key = None
+        if self.cache is not None:
+            key = LLMCache.key(model, messages, temperature, json_mode)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        attempt = 0
+        while True:
+            try:
+                content = await self._create_hedged(model, messages, temperature, json_mode, deadline_at)
+                if key is not None and content is not None:
+                    self.cache.put(key, content)
+                return content
+            except self._retryable as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = max(self._backoff(attempt), retry_after_s(e) or 0.0)
+                left = remaining(deadline_at)
+                if left is not None and delay >= left:
+                    raise DeadlineExceeded(f"Deadline leaves no time to retry after {e!r}") from e
+                await asyncio.sleep(delay)
+                attempt += 1
 
-    def chat(self, messages, *, temperature: float = 0.2, json_mode: bool = False) -> str:
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+class _LoopThread:
+    """
+    A private event loop running in a daemon thread, so sync callers (Streamlit,
+    thread pools) can share one AsyncLLMClient and its connection pool.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="llm-client-loop", daemon=True)
+        self._thread.start()
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+
+class LLMClient:
+    """
+    Blocking facade over AsyncLLMClient. Thread-safe: concurrent callers share the
+    pooled connections and the in-flight cap.
+    """
+
+    def __init__(self, **kwargs):
+        self._loop = _LoopThread()
+        try:
+            # Build the async client on its loop so the semaphore/pool bind there.
+            self.aclient: AsyncLLMClient = self._loop.run(self._make_async(**kwargs))
+        except Exception:
+            self._loop.loop.call_soon_threadsafe(self._loop.loop.stop)
+            raise
+        self.model = self.aclient.model
+        self.cache = self.aclient.cache
+
+    @staticmethod
+    async def _make_async(**kwargs) -> AsyncLLMClient:
+        return AsyncLLMClient(**kwargs)
+
+    def chat(self, messages, *, temperature: float = 0.2, json_mode: bool = False,
+             model: str | None = None) -> str:
         """
         messages: [{"role": "system"|"user"|"assistant", "content": "..."}]
         json_mode: if True, enforce JSON object output.
+        model: overrides OPENAI_MODEL for this call (e.g. a model cascade tier).
         Returns: assistant message content as string.
+        The caller's deadline (core.call_context) applies; the loop thread cannot see it,
+        so it is passed along explicitly.
         """
-        resp = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=temperature,
-            response_format={"type": "json_object"} if json_mode else None,
+        return self._loop.run(
+            self.aclient.chat(messages, temperature=temperature, json_mode=json_mode, model=model,
+                              deadline_at=deadline_var.get())
         )
-        return resp.choices[0].message.content
\ No newline at end of file
+
+    def close(self) -> None:
+        self._loop.run(self.aclient.aclose())
+
+
+_shared_client: LLMClient | None = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """
+    Process-wide LLMClient so callers reuse one connection pool instead of
+    building a new HTTP client per run. Responses are cached unless LLM_CACHE=0.
+    LLM_CASSETTE_MODE=record appends every call to the cassette at LLM_CASSETTE_PATH;
+    LLM_CASSETTE_MODE=replay serves responses from it without touching the API.
+    """
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            mode = (os.getenv("LLM_CASSETTE_MODE") or "").strip().lower()
+            path = os.getenv("LLM_CASSETTE_PATH") or os.path.join("data", "cassettes", "llm-{pid}.jsonl.gz")
+            if mode == "replay":
+                from core.llm_cassette import ReplayLLMClient
+                _shared_client = ReplayLLMClient(path.replace("{pid}", "*"))
+            else:
+                _shared_client = LLMClient(cache=LLMCache.from_env(), rate_limiter=TokenBucketLimiter.from_env())
+                if mode == "record":
+                    from core.llm_cassette import RecordingLLMClient
+                    _shared_client = RecordingLLMClient(_shared_client, path)
+        return _shared_client
@@ -1,15 +1,25 @@
 from __future__ import annotations
+from contextlib import nullcontext
 from typing import Any
 
+from core.call_context import bind, case_id_var, deadline
+
 class MCPRouter:
     """
     Minimal MCP-style router:
     - takes a payload
     - delegates to an agent
     - returns final structured state
+    A payload's case_id is bound for the duration of the run (see core.call_context), and
+    so is its deadline: payload "deadline_s", else `deadline_s`. Tools and LLM calls
+    under the run fail with DeadlineExceeded instead of outliving it.
     """
-    def __init__(self, agent):
+    def __init__(self, agent, *, deadline_s: float | None = None):
         self.agent = agent
+        self.deadline_s = deadline_s
 
     def route(self, payload: Any) -> dict:
-        return self.agent.run(payload)
+        case_id = payload.get("case_id") if isinstance(payload, dict) else None
+        deadline_s = payload.get("deadline_s", self.deadline_s) if isinstance(payload, dict) else self.deadline_s
+        with bind(case_id_var, case_id) if case_id else nullcontext(), deadline(deadline_s):
+            return self.agent.run(payload)
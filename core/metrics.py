@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+# Upper bounds (ms) of the cumulative histogram buckets, Prometheus-style.
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+class LatencyHistogram:
+    """
+    Bounded-memory latency summary:
+    - fixed cumulative buckets + count/sum over all observations
+    - ring buffer of the most recent samples for percentiles
+    """
+
+    def __init__(self, window: int = 1024):
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS_MS)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.recent: deque[float] = deque(maxlen=window)
+
+    def observe(self, ms: float) -> None:
+        self.count += 1
+        self.sum_ms += ms
+        self.recent.append(ms)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                self.bucket_counts[i] += 1
+
+    def percentile(self, p: float) -> float | None:
+        """
+        Nearest-rank percentile over the recent window.
+        """
+        if not self.recent:
+            return None
+        xs = sorted(self.recent)
+        return xs[max(0, math.ceil(p / 100 * len(xs)) - 1)]
+
+
+class ToolMetrics:
+    """
+    Thread-safe per-tool call counts, error counts and latency histograms.
+    Share one instance across ToolRegistry objects to aggregate a whole worker.
+    """
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._lock = threading.Lock()
+        self._hist: dict[str, LatencyHistogram] = {}
+        self._errors: dict[str, int] = {}
+
+    def record(self, tool: str, elapsed_ms: float, ok: bool) -> None:
+        with self._lock:
+            hist = self._hist.get(tool)
+            if hist is None:
+                hist = self._hist[tool] = LatencyHistogram(self.window)
+                self._errors[tool] = 0
+            hist.observe(elapsed_ms)
+            if not ok:
+                self._errors[tool] += 1
+
+    def snapshot(self) -> dict:
+        """
+        {tool: {calls, errors, error_rate, mean_ms, p50_ms, p90_ms, p99_ms, buckets}}
+        """
+        with self._lock:
+            out = {}
+            for tool, h in sorted(self._hist.items()):
+                errors = self._errors[tool]
+                out[tool] = {
+                    "calls": h.count,
+                    "errors": errors,
+                    "error_rate": errors / h.count if h.count else 0.0,
+                    "mean_ms": h.sum_ms / h.count if h.count else 0.0,
+                    "sum_ms": h.sum_ms,
+                    "p50_ms": h.percentile(50),
+                    "p90_ms": h.percentile(90),
+                    "p99_ms": h.percentile(99),
+                    "buckets": dict(zip(LATENCY_BUCKETS_MS, h.bucket_counts)),
+                }
+            return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hist.clear()
+            self._errors.clear()
+
+
+# -----------------------------
+# Exporters: snapshot -> text
+# -----------------------------
+def render_json(snapshot: dict) -> str:
+    return json.dumps(snapshot, indent=2, sort_keys=True)
+
+
+def render_prometheus(snapshot: dict) -> str:
+    lines = [
+        "# HELP tool_call_duration_ms Tool call latency in milliseconds.",
+        "# TYPE tool_call_duration_ms histogram",
+    ]
+    for tool, s in snapshot.items():
+        for bound, n in s["buckets"].items():
+            lines.append(f'tool_call_duration_ms_bucket{{tool="{tool}",le="{bound}"}} {n}')
+        lines.append(f'tool_call_duration_ms_bucket{{tool="{tool}",le="+Inf"}} {s["calls"]}')
+        lines.append(f'tool_call_duration_ms_sum{{tool="{tool}"}} {s["sum_ms"]:.3f}')
+        lines.append(f'tool_call_duration_ms_count{{tool="{tool}"}} {s["calls"]}')
+    lines += ["# HELP tool_call_errors_total Tool calls that raised.", "# TYPE tool_call_errors_total counter"]
+    for tool, s in snapshot.items():
+        lines.append(f'tool_call_errors_total{{tool="{tool}"}} {s["errors"]}')
+    return "\n".join(lines) + "\n"
+
+
+EXPORTERS: dict[str, Callable[[dict], str]] = {
+    "json": render_json,
+    "prometheus": render_prometheus,
+}
+
+
+def register_exporter(name: str, fn: Callable[[dict], str]) -> None:
+    EXPORTERS[name] = fn
+
+
+def export(metrics: ToolMetrics, fmt: str = "json") -> str:
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unknown metrics exporter: {fmt}")
+    return EXPORTERS[fmt](metrics.snapshot())
+
+
+def serve_metrics(metrics: ToolMetrics, port: int = 9108, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Background HTTP endpoint: /metrics (Prometheus text) and /metrics.json.
+    Returns the server; call .shutdown() to stop it.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, ctype = export(metrics, "prometheus"), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, ctype = export(metrics, "json"), "application/json"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+
+from core.call_context import DeadlineExceeded
+
+
+class TokenBucketLimiter:
+    """
+    Requests/min and tokens/min budgets shared by every thread and process using the same
+    SQLite file (one row per bucket `name`, updated under BEGIN IMMEDIATE).
+
+    `reserve` always takes its share and returns how long the caller must wait before
+    sending (the bucket may go negative): callers queue up at exactly the refill rate
+    instead of polling, so throughput sits at the budget rather than bursting and idling.
+    `penalize` pauses the bucket for everyone, e.g. for a provider's retry-after.
+    All calls block on SQLite; from an event loop, run them with asyncio.to_thread.
+    """
+
+    def __init__(self, path: str | None = None, *, requests_per_min: float | None = None,
+                 tokens_per_min: float | None = None, name: str = "default", burst_s: float = 1.0):
+        self.path = path or os.getenv("OPENAI_RATE_LIMIT_PATH") or os.path.join("data", "rate_limit.db")
+        self.name = name
+        self.request_rate = requests_per_min / 60 if requests_per_min else None
+        self.token_rate = tokens_per_min / 60 if tokens_per_min else None
+        # capacity: how far ahead of the steady rate a burst may run
+        self.burst_s = burst_s
+        self._lock = threading.Lock()
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._con = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("""
+        CREATE TABLE IF NOT EXISTS rate_buckets (
+            name TEXT PRIMARY KEY,
+            requests REAL,
+            tokens REAL,
+            updated_at REAL,
+            blocked_until REAL
+        )
+        """)
+
+    @classmethod
+    def from_env(cls) -> "TokenBucketLimiter | None":
+        """
+        Limiter from OPENAI_RPM / OPENAI_TPM (either may be unset); None when neither is set.
+        """
+        rpm = (os.getenv("OPENAI_RPM") or "").strip()
+        tpm = (os.getenv("OPENAI_TPM") or "").strip()
+        if not rpm and not tpm:
+            return None
+        return cls(requests_per_min=float(rpm) if rpm else None, tokens_per_min=float(tpm) if tpm else None,
+                   name="openai")
+
+    def _capacity(self, rate: float | None) -> float:
+        return max(1.0, rate * self.burst_s) if rate else 0.0
+
+    def reserve(self, tokens: float = 0.0, *, max_wait_s: float | None = None) -> float:
+        """
+        Take one request and `tokens` from the budget; returns the seconds to wait before
+        sending. If that wait would exceed `max_wait_s`, nothing is taken and
+        DeadlineExceeded is raised.
+        """
+        now = time.time()
+        with self._lock:
+            self._con.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._con.execute(
+                    "SELECT requests, tokens, updated_at, blocked_until FROM rate_buckets WHERE name=?",
+                    (self.name,),
+                ).fetchone()
+                if row is None:
+                    requests, budget, updated_at, blocked_until = (
+                        self._capacity(self.request_rate), self._capacity(self.token_rate), now, 0.0
+                    )
+                else:
+                    requests, budget, updated_at, blocked_until = row
+                elapsed = max(0.0, now - updated_at)
+
+                wait = max(0.0, blocked_until - now)
+                if self.request_rate:
+                    requests = min(self._capacity(self.request_rate), requests + elapsed * self.request_rate) - 1
+                    wait = max(wait, -requests / self.request_rate)
+                if self.token_rate and tokens:
+                    # a request larger than the whole capacity still goes through, once the bucket is full
+                    budget = min(self._capacity(self.token_rate), budget + elapsed * self.token_rate)
+                    budget -= min(tokens, self._capacity(self.token_rate))
+                    wait = max(wait, -budget / self.token_rate)
+
+                if max_wait_s is not None and wait > max_wait_s:
+                    self._con.execute("ROLLBACK")
+                    raise DeadlineExceeded(f"Rate limit wait {wait:.2f}s exceeds the {max_wait_s:.2f}s left")
+                self._con.execute(
+                    "INSERT OR REPLACE INTO rate_buckets(name, requests, tokens, updated_at, blocked_until)"
+                    " VALUES(?,?,?,?,?)",
+                    (self.name, requests, budget, now, blocked_until),
+                )
+                self._con.execute("COMMIT")
+            except DeadlineExceeded:
+                raise
+            except Exception:
+                self._con.execute("ROLLBACK")
+                raise
+        return wait
+
+    def refund(self, tokens: float) -> None:
+        """
+        Correct a reservation by `tokens` (positive: estimate was too high) once the
+        provider has reported actual usage.
+        """
+        if not self.token_rate or not tokens:
+            return
+        with self._lock:
+            self._con.execute(
+                "UPDATE rate_buckets SET tokens = MIN(tokens + ?, ?) WHERE name=?",
+                (tokens, self._capacity(self.token_rate), self.name),
+            )
+
+    def penalize(self, seconds: float) -> None:
+        """
+        Hold every caller of this bucket for `seconds` (e.g. a 429's retry-after).
+        """
+        until = time.time() + seconds
+        with self._lock:
+            cur = self._con.execute(
+                "UPDATE rate_buckets SET blocked_until = MAX(blocked_until, ?) WHERE name=?", (until, self.name)
+            )
+            if cur.rowcount == 0:
+                self._con.execute(
+                    "INSERT OR IGNORE INTO rate_buckets(name, requests, tokens, updated_at, blocked_until)"
+                    " VALUES(?,?,?,?,?)",
+                    (self.name, self._capacity(self.request_rate), self._capacity(self.token_rate), time.time(), until),
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._con.close()
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD in-flight limit for one event loop: +1 per window of successful responses
+    (additive increase), halved on overload - a 429 or 5xx - at most once per `cooldown_s`
+    so one burst of errors counts as one signal (multiplicative decrease).
+    Use as `async with limiter:` around a request, then report `on_success`/`on_overload`.
+    """
+
+    def __init__(self, *, initial: int = 4, minimum: int = 1, maximum: int = 64, cooldown_s: float = 1.0):
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown_s = cooldown_s
+        self.inflight = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._cond: asyncio.Condition | None = None
+
+    def _condition(self) -> asyncio.Condition:
+        # created lazily so it binds to the loop that uses it
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def __aenter__(self) -> "AdaptiveConcurrency":
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self.inflight < int(self.limit))
+            self.inflight += 1
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        cond = self._condition()
+        async with cond:
+            self.inflight -= 1
+            cond.notify_all()
+
+    def on_success(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def on_overload(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown_s:
+            return
+        self._last_decrease = now
+        self.decreases += 1
+        self.limit = max(self.minimum, self.limit / 2)
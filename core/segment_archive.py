@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+import struct
+import zlib
+from typing import Iterable
+
+# record = header (payload length, crc32 of payload) + zlib-compressed payload
+_HEADER = struct.Struct(">II")
+
+
+class SegmentArchive:
+    """
+    Append-only, compressed archive files ("segments") in one directory.
+    - append: compress records and add them to the end of a segment; returns their offsets
+    - read: fetch one record back by (segment, offset)
+    Segments are never rewritten, so they back up and replicate as plain files.
+    Appends to a segment must be serialized by the caller (one writer at a time).
+    """
+
+    def __init__(self, directory: str, *, level: int = 9):
+        self.directory = directory
+        self.level = level
+
+    def _path(self, segment: str) -> str:
+        if os.path.basename(segment) != segment:
+            raise ValueError(f"Invalid segment name: {segment}")
+        return os.path.join(self.directory, segment)
+
+    def append(self, segment: str, records: Iterable[bytes]) -> list[int]:
+        os.makedirs(self.directory, exist_ok=True)
+        offsets: list[int] = []
+        with open(self._path(segment), "ab") as f:
+            f.seek(0, os.SEEK_END)
+            offset = f.tell()
+            chunks = []
+            for record in records:
+                packed = zlib.compress(record, self.level)
+                offsets.append(offset)
+                chunks.append(_HEADER.pack(len(packed), zlib.crc32(packed)) + packed)
+                offset += _HEADER.size + len(packed)
+            f.write(b"".join(chunks))
+            f.flush()
+            os.fsync(f.fileno())
+        return offsets
+
+    def read(self, segment: str, offset: int) -> bytes:
+        with open(self._path(segment), "rb") as f:
+            f.seek(offset)
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"No record at {segment}@{offset}")
+            size, crc = _HEADER.unpack(header)
+            packed = f.read(size)
+        if len(packed) != size or zlib.crc32(packed) != crc:
+            raise ValueError(f"Corrupt record at {segment}@{offset}")
+        return zlib.decompress(packed)
+
+    def size(self) -> int:
+        if not os.path.isdir(self.directory):
+            return 0
+        return sum(e.stat().st_size for e in os.scandir(self.directory) if e.is_file())
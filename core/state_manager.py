@@ -1,15 +1,21 @@
 from __future__ import annotations
+import threading
 from typing import Any
 
 class StateManager:
     def __init__(self):
         self._state: dict[str, Any] = {}
+        # steps of a StepGraph may write concurrently
+        self._lock = threading.Lock()
 
     def set(self, key: str, value: Any) -> None:
-        self._state[key] = value
+        with self._lock:
+            self._state[key] = value
 
     def get(self, key: str, default: Any = None) -> Any:
-        return self._state.get(key, default)
+        with self._lock:
+            return self._state.get(key, default)
 
     def snapshot(self) -> dict:
-        return dict(self._state)
+        with self._lock:
+            return dict(self._state)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import json
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable
+
+from core.state_manager import StateManager
+
+
+class Step:
+    """
+    One node of a StepGraph.
+    - inputs: {kwarg_name: key} (or a list of keys used as kwarg names); keys are read
+      from the run's inputs or from state
+    - outputs: state key(s) written with the result; with several outputs `fn` must
+      return a dict containing each of them
+    - checkpoint: reuse a stored result when the step's inputs hash to a value seen
+      before (for expensive steps such as LLM calls; results must be JSON-serializable)
+    """
+
+    def __init__(self, name: str, fn: Callable[..., Any], *,
+                 inputs: dict[str, str] | Iterable[str] = (), outputs: str | Iterable[str] = (),
+                 checkpoint: bool = False):
+        self.name = name
+        self.fn = fn
+        self.inputs = dict(inputs) if isinstance(inputs, dict) else {k: k for k in inputs}
+        self.outputs = [outputs] if isinstance(outputs, str) else list(outputs)
+        self.checkpoint = checkpoint
+
+    def input_hash(self, kwargs: dict) -> str:
+        payload = json.dumps({"step": self.name, "inputs": kwargs}, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def __repr__(self) -> str:
+        return f"Step({self.name!r}, inputs={list(self.inputs.values())}, outputs={self.outputs})"
+
+
+class StepGraph:
+    """
+    Dependency-aware executor: a step runs as soon as all of its inputs exist, and
+    independent steps run concurrently on a thread pool. Outputs land in StateManager.
+
+    Checkpoint stores are duck-typed:
+        load(step_name, input_hash) -> (found: bool, output)
+        save(step_name, input_hash, output) -> None
+    """
+
+    def __init__(self, steps: Iterable[Step] = ()):
+        self.steps: list[Step] = []
+        self._producers: dict[str, Step] = {}
+        # names of checkpointed steps whose stored output was reused in the last run
+        self.reused: list[str] = []
+        for step in steps:
+            self.add(step)
+
+    def add(self, step: Step) -> "StepGraph":
+        if any(s.name == step.name for s in self.steps):
+            raise ValueError(f"Duplicate step name: {step.name}")
+        for key in step.outputs:
+            if key in self._producers:
+                raise ValueError(f"State key '{key}' produced by both {self._producers[key].name} and {step.name}")
+            self._producers[key] = step
+        self.steps.append(step)
+        return self
+
+    def _check(self, available: set[str]) -> None:
+        # every input must be given or produced, and the graph must be acyclic
+        for step in self.steps:
+            for key in step.inputs.values():
+                if key not in available and key not in self._producers:
+                    raise ValueError(f"Step {step.name} needs '{key}', which is neither provided nor produced")
+        done = set(available)
+        remaining = list(self.steps)
+        while remaining:
+            ready = [s for s in remaining if all(k in done for k in s.inputs.values())]
+            if not ready:
+                raise ValueError(f"Cycle between steps: {[s.name for s in remaining]}")
+            for s in ready:
+                done.update(s.outputs)
+                remaining.remove(s)
+
+    def run(self, state: StateManager, *, inputs: dict | None = None, max_workers: int = 4,
+            checkpoints=None) -> StateManager:
+        """
+        Execute all steps. `inputs` are read-only values visible to steps but not copied
+        into state. The first step to raise aborts the run (running steps finish,
+        nothing new is scheduled) and its exception propagates.
+        With `checkpoints`, checkpointed steps whose inputs are unchanged since their last
+        successful run reuse the stored output instead of executing again.
+        """
+        inputs = dict(inputs or {})
+        available = set(inputs) | {k for k in state.snapshot() if k not in self._producers}
+        self._check(available)
+
+        def resolve(step: Step) -> dict:
+            return {
+                arg: inputs[key] if key in inputs and key not in self._producers else state.get(key)
+                for arg, key in step.inputs.items()
+            }
+
+        self.reused = []
+
+        def execute(step: Step, kwargs: dict) -> Any:
+            if checkpoints is None or not step.checkpoint:
+                return step.fn(**kwargs)
+            key = step.input_hash(kwargs)
+            found, output = checkpoints.load(step.name, key)
+            if found:
+                self.reused.append(step.name)
+                return output
+            output = step.fn(**kwargs)
+            checkpoints.save(step.name, key, output)
+            return output
+
+        def finish(step: Step, result: Any) -> None:
+            if len(step.outputs) == 1:
+                state.set(step.outputs[0], result)
+            elif step.outputs:
+                for key in step.outputs:
+                    state.set(key, result[key])
+            done.update(step.outputs)
+
+        done = set(available)
+        pending = list(self.steps)
+        running: dict[Future, Step] = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="step") as pool:
+            while pending or running:
+                ready = [s for s in pending if all(k in done for k in s.inputs.values())]
+                for s in ready:
+                    pending.remove(s)
+
+                # a lone ready step with nothing in flight runs inline (no thread hop for chains)
+                if len(ready) == 1 and not running:
+                    finish(ready[0], execute(ready[0], resolve(ready[0])))
+                    continue
+
+                for s in ready:
+                    ctx = contextvars.copy_context()
+                    running[pool.submit(ctx.run, execute, s, resolve(s))] = s
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    step = running.pop(fut)
+                    exc = fut.exception()
+                    if exc is not None:
+                        wait(running)
+                        raise exc
+                    finish(step, fut.result())
+        return state
@@ -1,37 +1,52 @@
 from __future__ import annotations
+from collections import deque
 from typing import Callable, Any
 import time
 
+from core.call_context import bind, deadline, remaining, tool_var
+from core.metrics import ToolMetrics, export
+
 class ToolRegistry:
-    def __init__(self):
+    def __init__(self, *, metrics: ToolMetrics | None = None, log_size: int = 1000):
         self._tools: dict[str, Callable[..., Any]] = {}
-        self._log: list[dict] = []
+        self._timeouts: dict[str, float] = {}
+        # ring buffer of recent calls; aggregates live in `metrics`
+        self._log: deque[dict] = deque(maxlen=log_size)
+        self.metrics = metrics or ToolMetrics()
 
-    def register(self, name: str, fn: Callable[..., Any]) -> None:
+    def register(self, name: str, fn: Callable[..., Any], *, timeout_s: float | None = None) -> None:
+        """
+        `timeout_s` caps each call of the tool; it can only shorten the caller's deadline.
+        """
         self._tools[name] = fn
+        if timeout_s is not None:
+            self._timeouts[name] = timeout_s
 
     def execute(self, name: str, **kwargs) -> Any:
         if name not in self._tools:
             raise ValueError(f"Tool not registered: {name}")
 
-        start = time.time()
+        start = time.perf_counter()
         status = "OK"
         err = None
 
         try:
-            result = self._tools[name](**kwargs)
+            with bind(tool_var, name), deadline(self._timeouts.get(name)):
+                remaining()  # fail fast if the run's deadline already passed
+                result = self._tools[name](**kwargs)
             return result
         except Exception as e:
             status = "ERROR"
             err = repr(e)
             raise
         finally:
-            elapsed_ms = int((time.time() - start) * 1000)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.metrics.record(name, elapsed_ms, ok=(status == "OK"))
             # store a light log (no huge blobs)
             self._log.append({
                 "tool": name,
                 "status": status,
-                "elapsed_ms": elapsed_ms,
+                "elapsed_ms": round(elapsed_ms, 3),
                 "inputs_keys": sorted(list(kwargs.keys())),
                 "error": err,
             })
@@ -43,4 +58,13 @@ class ToolRegistry:
         return list(self._log)
 
     def clear_log(self) -> None:
-        self._log = []
\ No newline at end of file
+        self._log.clear()
+
+    def get_metrics(self) -> dict:
+        return self.metrics.snapshot()
+
+    def export_metrics(self, fmt: str = "json") -> str:
+        """
+        Render metrics with a registered exporter ("json", "prometheus", ...).
+        """
+        return export(self.metrics, fmt)
@@ -1,29 +1,24 @@
 from __future__ import annotations
 
+import json
 import streamlit as st
 import tempfile
 import uuid
-import traceback
-
-from core.llm_client import LLMClient
-from core.tool_registry import ToolRegistry
-from core.state_manager import StateManager
-from core.mcp_router import MCPRouter
 
+from core.config import load_config
 from products.transfer_orchestrator.db import (
     init_db,
-    save_case,
     set_human_decision,
     list_cases,
+    next_cursor,
+    cases_version,
     get_case,
+    search_cases,
 )
-from products.transfer_orchestrator.workflow import TransferAgent
+from products.transfer_orchestrator.worker import enqueue_case, get_queue
 from products.transfer_orchestrator.tools import (
     extract_text_from_pdf,
     normalize_text,
-    extract_fields,
-    validate_fields,
-    generate_review,
 )
 
 # -----------------------------
@@ -34,23 +29,58 @@ st.title("Transfer Orchestrator (Agentic Prototype)")
 st.caption("AI orchestrates extraction + validation + drafting. Human approves regulated action.")
 
 # -----------------------------
-# Init persistence
+# Init config + persistence
 # -----------------------------
+load_config()
 init_db()
 
 # -----------------------------
 # Sidebar - recent cases
 # -----------------------------
+@st.cache_data(max_entries=64)
+def cached_case_page(version: int, after: tuple[str, str] | None, limit: int = 20) -> list[dict]:
+    # `version` is only part of the cache key: any write to cases bumps it and misses the cache
+    return list_cases(limit, after=after)
+
 with st.sidebar:
     st.header("Recent Cases")
-    cases = list_cases()
+    # cursors of the pages before the current one (keyset pagination)
+    page_cursors = st.session_state.setdefault("case_page_cursors", [None])
+    cases = cached_case_page(cases_version(), page_cursors[-1])
     if not cases:
         st.caption("No cases saved yet.")
     else:
         for c in cases:
             st.write(
-                f"- **{c['case_id']}** ({c['source_name']})  \n"
-                f"Path: {c['path']}  \n"
+                f"- **{c['case_id']}** {c['client_full_name'] or ''} ({c['source_name']})  \n"
+                f"Validation: {c['validation_status'] or '—'} · Next: {c['recommended_next_step'] or '—'}  \n"
+                f"Gate: {c['gate_decision'] or '—'} · Decision: {c['human_decision'] or '—'}"
+            )
+    prev_col, next_col = st.columns(2)
+    if prev_col.button("Newer", disabled=len(page_cursors) == 1):
+        page_cursors.pop()
+        st.rerun()
+    if next_col.button("Older", disabled=len(cases) < 20):
+        page_cursors.append(next_cursor(cases))
+        st.rerun()
+
+    st.header("Search Cases")
+    search_text = st.text_input("Document text", placeholder="e.g. fidelity rollover")
+    search_email = st.text_input("Client email")
+    search_institution = st.text_input("Sending institution (prefix)")
+    search_status = st.selectbox("Validation status", ["Any", "PASS", "WARN", "FAIL"])
+    if search_text.strip() or search_email.strip() or search_institution.strip() or search_status != "Any":
+        hits = search_cases(
+            search_text,
+            client_email=search_email or None,
+            sending_institution=search_institution or None,
+            validation_status=None if search_status == "Any" else search_status,
+        )
+        st.caption(f"{len(hits)} match(es)" + (" (showing first 50)" if len(hits) == 50 else ""))
+        for c in hits:
+            st.write(
+                f"- **{c['case_id']}** {c['client_full_name'] or ''}  \n"
+                f"{c['sending_institution'] or '—'} · {c['validation_status'] or '—'}  \n"
                 f"Decision: {c['human_decision'] or '—'}"
             )
 
@@ -99,34 +129,33 @@ if run:
     # Normalize text
     text = normalize_text(text)
 
-    # Run workflow
-    with st.spinner("Running agent workflow..."):
-        try:
-            llm = LLMClient()
-            tools = ToolRegistry()
-            tools.clear_log()
-            state = StateManager()
-
-            tools.register("extract_fields", lambda text: extract_fields(llm, text))
-            tools.register("validate_fields", lambda fields: validate_fields(fields))
-            tools.register("generate_review", lambda fields, validation: generate_review(llm, fields, validation))
+    # Queue for background workers (python -m products.transfer_orchestrator.worker);
+    # the case ID lives in the URL so a refresh keeps tracking it.
+    enqueue_case(case_id, source_name, text)
+    st.query_params["case"] = case_id
+    st.rerun()
 
-            agent = TransferAgent(llm, tools, state)
-            router = MCPRouter(agent)
-
-            state_out = router.route({"document_text": text})
-
-        except Exception:
-            st.error("Agent failed. Full error below:")
-            st.code(traceback.format_exc())
-            st.stop()
+# -----------------------------
+# Active case: poll status, render when done
+# -----------------------------
+def render_case(case_id: str, job: dict) -> None:
+    c = get_case(case_id)
+    if not c:
+        st.error("Case not found.")
+        return
+    state_out = {
+        "fields": json.loads(c["fields_json"] or "{}"),
+        "validation": json.loads(c["validation_json"] or "{}"),
+        "review": json.loads(c["review_json"] or "{}"),
+    }
 
     # Tool log
+    result = job.get("result") or {}
     st.markdown("### Tool Call Log")
-    st.dataframe(tools.get_log(), use_container_width=True)
+    st.dataframe(result.get("tool_log", []), use_container_width=True)
+    if result.get("reused_steps"):
+        st.caption(f"Reused from checkpoint: {', '.join(result['reused_steps'])}")
 
-    # Persist
-    save_case(case_id, source_name, text, state_out)
     st.success(f"Saved case: {case_id}")
 
     # Render outputs
@@ -184,6 +213,34 @@ if run:
             height=110,
         )
 
+
+active_case = st.query_params.get("case")
+if active_case:
+    queue = get_queue()
+    job = queue.get(active_case)
+    st.subheader(f"Case {active_case}")
+    if job is None:
+        st.warning("No job found for this case. Use 'Load existing case' below.")
+    elif job["status"] in ("queued", "leased"):
+        @st.fragment(run_every=2)
+        def poll_status():
+            j = queue.get(active_case)
+            if j["status"] in ("queued", "leased"):
+                st.info(f"Status: {j['status'].upper()} (attempt {j['attempts']} of {j['max_attempts']}). "
+                        "You can keep working; this page updates automatically.")
+            else:
+                st.rerun()
+
+        poll_status()
+    elif job["status"] == "dead":
+        st.error("Agent failed after all retries. Full error below:")
+        st.code(job["error"] or "")
+        if st.button("Retry case"):
+            queue.requeue(active_case)
+            st.rerun()
+    else:
+        render_case(active_case, job)
+
 st.divider()
 st.subheader("Load existing case")
 load_id = st.text_input("Enter case ID to load", value="")
@@ -205,4 +262,24 @@ if st.button("Load Case"):
         st.code(c["validation_json"] or "{}", language="json")
 
         st.markdown("**Review**")
-        st.code(c["review_json"] or "{}", language="json")
\ No newline at end of file
+        st.code(c["review_json"] or "{}", language="json")
+
+st.divider()
+st.subheader("Re-run case with corrections")
+st.caption("Only steps whose inputs changed are recomputed; extraction is reused from the case checkpoint.")
+rerun_id = st.text_input("Case ID to re-run", value="")
+corrections_raw = st.text_area("Field corrections (JSON)", value="{}", height=120)
+
+if st.button("Re-run Case"):
+    c = get_case(rerun_id.strip())
+    if not c:
+        st.error("Case not found.")
+    else:
+        try:
+            corrections = json.loads(corrections_raw or "{}")
+        except json.JSONDecodeError as e:
+            st.error(f"Corrections are not valid JSON: {e}")
+            st.stop()
+        enqueue_case(c["case_id"], c["source_name"], c["document_text"], field_corrections=corrections)
+        st.query_params["case"] = c["case_id"]
+        st.rerun()
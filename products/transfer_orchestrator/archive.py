@@ -0,0 +1,88 @@
+"""
+Tiered storage: move old and closed cases out of the hot database.
+
+Cases created more than --older-than-days ago (CASE_ARCHIVE_AFTER_DAYS, default 90) or
+closed by a final human decision get their heavy columns (document text, fields,
+validation, review) appended to compressed monthly segment files
+(data/archive/cases-YYYY-MM.seg). The slim row left behind keeps the summary columns,
+the decision and the full-text entry, so listing and search are unchanged, and
+`db.get_case` reads the rest back transparently. Documents still needed by unfinished
+worker jobs are kept in the artifact store.
+
+Usage:
+    python -m products.transfer_orchestrator.archive --dry-run
+    python -m products.transfer_orchestrator.archive --older-than-days 30 --vacuum
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from core.config import load_config
+
+from products.transfer_orchestrator import db
+from products.transfer_orchestrator.db import (
+    FINAL_DECISIONS,
+    archive_candidates,
+    archive_cases,
+    case_archive,
+    compact_db,
+    init_db,
+)
+
+
+def archive_all(*, older_than_days: float | None = None, include_decided: bool = True,
+                batch_size: int = 500, dry_run: bool = False, vacuum: bool = False, out=sys.stdout) -> dict:
+    init_db()
+    if older_than_days is None:
+        older_than_days = float(os.getenv("CASE_ARCHIVE_AFTER_DAYS", "90"))
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    decisions = FINAL_DECISIONS if include_decided else ()
+    started = time.perf_counter()
+
+    if dry_run:
+        n = len(archive_candidates(older_than=cutoff, final_decisions=decisions, limit=-1))
+        print(f"Would archive {n} cases (created before {cutoff:%Y-%m-%d}"
+              f"{' or with a final decision' if decisions else ''})", file=out)
+        return {"archived": n, "dry_run": True}
+
+    # imported here: the worker module pulls in the agent, which --help does not need
+    from products.transfer_orchestrator.worker import pending_document_refs
+
+    archived = 0
+    while True:
+        batch = archive_candidates(older_than=cutoff, final_decisions=decisions, limit=batch_size)
+        if not batch:
+            break
+        archived += archive_cases(batch, keep_refs=pending_document_refs())
+        print(f"archived {archived}", file=out, flush=True)
+
+    db_bytes = compact_db() if vacuum else os.path.getsize(db.DB_PATH)
+    archive_bytes = case_archive().size()
+    elapsed = time.perf_counter() - started
+    print(f"Done in {elapsed:.1f}s: {archived} cases archived; hot db {db_bytes / 1e6:.1f} MB, "
+          f"archive {archive_bytes / 1e6:.1f} MB", file=out)
+    return {"archived": archived, "db_bytes": db_bytes, "archive_bytes": archive_bytes, "dry_run": False}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Archive old and closed cases into compressed segments.")
+    parser.add_argument("--older-than-days", type=float, default=None,
+                        help="archive cases created before this age (default: CASE_ARCHIVE_AFTER_DAYS or 90)")
+    parser.add_argument("--no-decided", action="store_true",
+                        help="do not archive newer cases just because they have a final human decision")
+    parser.add_argument("--batch-size", type=int, default=500, help="cases per archive transaction")
+    parser.add_argument("--dry-run", action="store_true", help="report how many cases would move")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM the hot database afterwards")
+    args = parser.parse_args(argv)
+    load_config()
+    archive_all(older_than_days=args.older_than_days, include_decided=not args.no_decided,
+                batch_size=args.batch_size, dry_run=args.dry_run, vacuum=args.vacuum)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""
+Headless batch runner: extract -> validate -> review over many documents at once.
+
+Usage:
+    python -m products.transfer_orchestrator.batch data/inbox --concurrency 8
+    python -m products.transfer_orchestrator.batch --manifest morning.txt
+
+A manifest is a text file with one document path per line (relative paths are
+resolved against the manifest's directory; blank lines and `#` comments are ignored).
+Each document becomes a case whose ID is the file stem plus a short hash of the file's
+content, so re-running the same file updates its case while a different document that
+happens to share a name gets a new one. Results are persisted with
+`db.save_cases`, batched into one transaction per `save_batch` completed cases.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable
+
+from core.config import load_config
+from core.llm_client import get_llm_client
+from core.metrics import ToolMetrics, export, serve_metrics
+
+from products.transfer_orchestrator.db import init_db, save_cases
+from products.transfer_orchestrator.tools import extract_text_from_pdf, extract_text_streaming, normalize_text
+from products.transfer_orchestrator.workflow import build_router
+
+SUPPORTED_EXTS = {".pdf", ".txt"}
+CASE_HASH_CHARS = 8
+
+
+def _read_manifest(manifest_path: str) -> list[str]:
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    paths: list[str] = []
+    with open(manifest_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            paths.append(line if os.path.isabs(line) else os.path.join(base, line))
+    return paths
+
+
+def _content_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:CASE_HASH_CHARS]
+
+
+def collect_documents(inputs: Iterable[str], manifest: str | None = None) -> list[tuple[str, str]]:
+    """
+    Resolve directories / files / a manifest into (case_id, path) pairs.
+    Case IDs are `<file stem>-<content hash>`, suffixed when the same content is listed twice.
+    """
+    paths: list[str] = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for name in sorted(os.listdir(item)):
+                p = os.path.join(item, name)
+                if os.path.isfile(p) and os.path.splitext(name)[1].lower() in SUPPORTED_EXTS:
+                    paths.append(p)
+        else:
+            paths.append(item)
+    if manifest:
+        paths.extend(_read_manifest(manifest))
+
+    docs: list[tuple[str, str]] = []
+    seen: dict[str, int] = {}
+    for p in paths:
+        stem = f"{os.path.splitext(os.path.basename(p))[0]}-{_content_hash(p)}"
+        n = seen.get(stem, 0)
+        seen[stem] = n + 1
+        docs.append((stem if n == 0 else f"{stem}-{n}", p))
+    return docs
+
+
+def load_document(path: str, *, pdf_workers: int | None = 1, max_pages: int | None = None,
+                  early_exit: bool = False) -> str:
+    """
+    Read a PDF or text file and normalize it the same way the UI does.
+    With `early_exit` or `max_pages`, PDFs are streamed page by page instead.
+    """
+    if path.lower().endswith(".pdf"):
+        if early_exit or max_pages:
+            text = extract_text_streaming(path, max_pages=max_pages, stop_when_complete=early_exit)
+        else:
+            text = extract_text_from_pdf(path, workers=pdf_workers)
+    else:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    return normalize_text(text)
+
+
+def process_document(llm, case_id: str, path: str, *, metrics: ToolMetrics | None = None,
+                     **load_opts) -> tuple[dict, str, dict]:
+    """
+    Run one document through the agent.
+    Returns (result record, document text, agent state) so the caller can persist it.
+    `load_opts` are passed to load_document.
+    """
+    start = time.perf_counter()
+    text = load_document(path, **load_opts)
+    if not text:
+        raise ValueError("No text extracted (may be scanned).")
+
+    router, _ = build_router(llm, metrics=metrics)
+    state_out = router.route({"document_text": text, "case_id": case_id})
+
+    decision = state_out.get("review", {}).get("human_must_decide", {}).get("decision")
+    result = {
+        "case_id": case_id,
+        "path": path,
+        "status": "OK",
+        "validation": state_out.get("validation", {}).get("status"),
+        "decision": decision,
+        "elapsed_s": time.perf_counter() - start,
+    }
+    return result, text, state_out
+
+
+def run_batch(docs: list[tuple[str, str]], *, concurrency: int = 4, source_name: str = "Batch",
+              save_batch: int = 25, llm=None, metrics: ToolMetrics | None = None, out=sys.stdout,
+              **load_opts) -> list[dict]:
+    """
+    Process documents concurrently. LLM latency dominates, so threads are enough to
+    overlap the round trips; `concurrency` bounds the number of cases in flight.
+    Saves happen on this thread only, `save_batch` cases per transaction.
+    Tool timings from every case are aggregated into `metrics`.
+    `load_opts` (pdf_workers, max_pages, early_exit) are passed to load_document.
+    """
+    init_db()
+    llm = llm or get_llm_client()
+    metrics = metrics if metrics is not None else ToolMetrics()
+    total = len(docs)
+    results: list[dict] = []
+    pending: list[tuple[str, str, str, dict]] = []
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {
+            pool.submit(process_document, llm, case_id, path, metrics=metrics, **load_opts): (case_id, path)
+            for case_id, path in docs
+        }
+        for fut in as_completed(futures):
+            case_id, path = futures[fut]
+            try:
+                res, text, state_out = fut.result()
+                pending.append((case_id, source_name, text, state_out))
+                if len(pending) >= save_batch:
+                    save_cases(pending)
+                    pending = []
+            except Exception as e:
+                res = {"case_id": case_id, "path": path, "status": "ERROR", "error": repr(e)}
+                traceback.print_exc(file=sys.stderr)
+            results.append(res)
+
+            elapsed = time.perf_counter() - started
+            rate = len(results) / elapsed * 60 if elapsed > 0 else 0.0
+            detail = (
+                f"{res['validation']} / {res['decision']}" if res["status"] == "OK" else res["error"]
+            )
+            print(
+                f"[{len(results)}/{total}] {case_id}: {res['status']} ({detail}) "
+                f"- {rate:.1f} cases/min",
+                file=out,
+                flush=True,
+            )
+
+    save_cases(pending)
+    elapsed = time.perf_counter() - started
+    ok = sum(1 for r in results if r["status"] == "OK")
+    rate = len(results) / elapsed * 60 if elapsed > 0 else 0.0
+    print(
+        f"Done: {ok}/{total} OK, {total - ok} failed in {elapsed:.1f}s ({rate:.1f} cases/min)",
+        file=out,
+        flush=True,
+    )
+    for tool, st in metrics.snapshot().items():
+        print(
+            f"  {tool}: {st['calls']} calls, {st['errors']} errors, "
+            f"p50 {st['p50_ms']:.1f}ms, p99 {st['p99_ms']:.1f}ms",
+            file=out,
+            flush=True,
+        )
+    cache = getattr(llm, "cache", None)
+    if cache is not None:
+        st = cache.stats()
+        print(f"LLM cache: {st['hits']} hits, {st['misses']} misses ({st['hit_rate']:.0%})", file=out, flush=True)
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the transfer workflow over many documents.")
+    parser.add_argument("inputs", nargs="*", help="PDF/text files or directories containing them")
+    parser.add_argument("--manifest", help="text file listing one document path per line")
+    parser.add_argument("--concurrency", type=int, default=4, help="cases processed in parallel")
+    parser.add_argument("--source-name", default="Batch", help="source name stored on each case")
+    parser.add_argument("--pdf-workers", type=int, default=1,
+                        help="processes per PDF for page extraction (0 = all cores); applies to long PDFs only")
+    parser.add_argument("--save-batch", type=int, default=25, help="cases saved per database transaction")
+    parser.add_argument("--metrics-out", help="write tool metrics here (.prom = Prometheus text, else JSON)")
+    parser.add_argument("--metrics-port", type=int, help="serve live /metrics and /metrics.json on this port")
+    parser.add_argument("--max-pages", type=int, default=None, help="read at most this many pages per PDF")
+    parser.add_argument("--early-exit", action="store_true",
+                        help="stop reading a PDF once all required fields and the signature line are found (streams pages)")
+    args = parser.parse_args(argv)
+    load_config()
+
+    docs = collect_documents(args.inputs, args.manifest)
+    if not docs:
+        parser.error("no documents found (pass files, directories or --manifest)")
+
+    metrics = ToolMetrics()
+    if args.metrics_port:
+        serve_metrics(metrics, port=args.metrics_port)
+
+    results = run_batch(
+        docs,
+        metrics=metrics,
+        concurrency=args.concurrency,
+        source_name=args.source_name,
+        save_batch=args.save_batch,
+        pdf_workers=args.pdf_workers or None,
+        max_pages=args.max_pages,
+        early_exit=args.early_exit,
+    )
+    if args.metrics_out:
+        fmt = "prometheus" if args.metrics_out.endswith(".prom") else "json"
+        with open(args.metrics_out, "w", encoding="utf-8") as f:
+            f.write(export(metrics, fmt))
+    return 0 if all(r["status"] == "OK" for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Model cascade for field extraction.
+
+Most forms are easy: a small, fast model extracts them as well as a large one. The
+cascade runs `extract_fields` on the cheapest model first and re-runs it on the next
+tier only when the result is not clean - `validate_fields` reports a status the policy
+escalates on, or a key field came back null - or when the call itself failed (API
+error, unparseable JSON); only the last tier's failure is raised. Each tier's calls are recorded in
+ToolMetrics as "extract_fields@<model>", so the exporters show how often each tier runs.
+
+Configured from the environment:
+    EXTRACT_MODEL_CASCADE=gpt-4o-mini,gpt-4o     models, cheapest first (unset: no cascade)
+    EXTRACT_ESCALATE_ON=WARN,FAIL                validation statuses that escalate
+    EXTRACT_ESCALATE_FIELDS=client_full_name,... fields that escalate when null
+"""
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Iterable
+
+from core.call_context import DeadlineExceeded
+from core.metrics import ToolMetrics
+
+from products.transfer_orchestrator.tools import REQUIRED_FIELDS, extract_fields, validate_fields
+
+
+def _env_list(name: str) -> list[str] | None:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return None
+    return [item.strip() for item in raw.split(",") if item.strip()]
+
+
+class CascadePolicy:
+    """
+    Which models to try, in order, and when a result is not good enough to stop.
+    """
+
+    def __init__(self, models: Iterable[str], *, escalate_on: Iterable[str] = ("WARN", "FAIL"),
+                 key_fields: Iterable[str] = REQUIRED_FIELDS):
+        self.models = [m for m in models if m]
+        self.escalate_on = {s.upper() for s in escalate_on}
+        self.key_fields = list(key_fields)
+
+    @classmethod
+    def from_env(cls) -> "CascadePolicy | None":
+        """
+        Policy from EXTRACT_MODEL_CASCADE / EXTRACT_ESCALATE_ON / EXTRACT_ESCALATE_FIELDS;
+        None unless at least two models are configured.
+        """
+        models = _env_list("EXTRACT_MODEL_CASCADE") or []
+        if len(models) < 2:
+            return None
+        return cls(
+            models,
+            escalate_on=_env_list("EXTRACT_ESCALATE_ON") or ("WARN", "FAIL"),
+            key_fields=_env_list("EXTRACT_ESCALATE_FIELDS") or REQUIRED_FIELDS,
+        )
+
+    def escalation_reason(self, fields: dict, validation: dict) -> str | None:
+        """
+        Why this result should go to the next tier, or None to accept it.
+        """
+        missing = [k for k in self.key_fields if fields.get(k) is None]
+        if missing:
+            return f"null: {', '.join(missing)}"
+        status = (validation.get("status") or "").upper()
+        if status in self.escalate_on:
+            return f"validation: {status}"
+        return None
+
+
+def extract_fields_cascade(llm, text: str, policy: CascadePolicy, *,
+                           metrics: ToolMetrics | None = None) -> dict[str, Any]:
+    """
+    `extract_fields` tier by tier until the policy accepts a result or the last tier ran.
+    The returned fields carry `_cascade`: the model that produced them, its tier (0 =
+    cheapest) and the reason each earlier tier was escalated. A tier that raises is
+    escalated too, except on the last tier or when the deadline has passed.
+    """
+    escalated: list[dict] = []
+    last = len(policy.models) - 1
+    for tier, model in enumerate(policy.models):
+        start = time.perf_counter()
+        ok = False
+        try:
+            fields = extract_fields(llm, text, model=model)
+            ok = True
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            if tier == last:
+                raise
+            escalated.append({"model": model, "reason": f"error: {e!r}"})
+            continue
+        finally:
+            if metrics is not None:
+                metrics.record(f"extract_fields@{model}", (time.perf_counter() - start) * 1000, ok=ok)
+        if fields.get("_extraction") == "rules":
+            # no model was involved; a stronger one cannot do better
+            return fields
+        reason = policy.escalation_reason(fields, validate_fields(fields, text))
+        if reason is None or tier == last:
+            break
+        escalated.append({"model": model, "reason": reason})
+    fields["_cascade"] = {"model": model, "tier": tier, "escalated": escalated}
+    return fields
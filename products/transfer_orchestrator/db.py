@@ -2,14 +2,97 @@ from __future__ import annotations
 import os
 import json
 import sqlite3
+import threading
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Iterator, Optional
+
+from core.artifact_store import ArtifactStore
+from core.segment_archive import SegmentArchive
 
 DB_PATH = os.path.join("data", "cases.db")
 
+# human decisions after which a case is closed and may be archived regardless of age
+FINAL_DECISIONS = ("APPROVE_TO_PROCEED",)
+# moved out of the hot row by archive_cases (document_ref stays: re-saves compare against it)
+ARCHIVED_COLUMNS = ["document_text", "fields_json", "validation_json", "review_json"]
+# unreferenced artifacts stored (or re-stored) more recently than this are kept: a job may
+# have been handed the ref without a case row pointing at it yet
+ARTIFACT_GRACE_S = 24 * 3600
+
+_local = threading.local()
+_stores: dict[str, ArtifactStore] = {}
+
+# Extracted fields copied into real (indexed) columns so lookups never parse fields_json
+FIELD_COLUMNS = [
+    "client_full_name",
+    "client_email",
+    "sending_institution",
+    "receiving_institution",
+    "account_type",
+    "transfer_type",
+]
+# Derived from validation/review; rewritten whenever those are (save or re-validation)
+RESULT_COLUMNS = ["validation_status", "recommended_next_step", "gate_decision"]
+SUMMARY_COLUMNS = FIELD_COLUMNS + RESULT_COLUMNS
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+def artifact_store() -> ArtifactStore:
+    """
+    Content-addressed store for document text, kept in the cases database file
+    (so one file still holds everything); case rows reference it by `document_ref`.
+    """
+    store = _stores.get(DB_PATH)
+    if store is None:
+        store = _stores[DB_PATH] = ArtifactStore(DB_PATH)
+    return store
+
+def case_archive() -> SegmentArchive:
+    """
+    Cold tier: monthly, append-only segment files next to the cases database
+    (or in CASE_ARCHIVE_DIR).
+    """
+    directory = os.getenv("CASE_ARCHIVE_DIR") or os.path.join(os.path.dirname(DB_PATH) or ".", "archive")
+    return SegmentArchive(directory)
+
+def _persisted_fields(fields: dict) -> dict:
+    # raw text lives in the artifact store; older extractions still carry a copy
+    return {k: v for k, v in (fields or {}).items() if k != "_raw_text"}
+
+def _summary(state: dict) -> dict:
+    """
+    Denormalized, searchable columns derived from the agent state. Without "fields"
+    in `state` only RESULT_COLUMNS are returned.
+    """
+    out = {}
+    if "fields" in state:
+        fields = state.get("fields") or {}
+        out = {k: (str(fields[k]).strip() or None) if fields.get(k) is not None else None for k in FIELD_COLUMNS}
+    review = state.get("review") or {}
+    out["validation_status"] = (state.get("validation") or {}).get("status")
+    out["recommended_next_step"] = review.get("recommended_next_step")
+    out["gate_decision"] = (review.get("human_must_decide") or {}).get("decision")
+    return out
+
 def _conn():
-    os.makedirs("data", exist_ok=True)
-    return sqlite3.connect(DB_PATH)
+    """
+    Thread-local connection, opened once per thread/process and reused.
+    WAL lets readers (UI sessions) run alongside a writer (batch/worker), and
+    busy_timeout waits for the write lock instead of failing with "database is locked".
+    """
+    con = getattr(_local, "con", None)
+    if con is not None and _local.path == DB_PATH and _local.pid == os.getpid():
+        return con
+
+    os.makedirs(os.path.dirname(DB_PATH) or ".", exist_ok=True)
+    con = sqlite3.connect(DB_PATH, timeout=30)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.execute("PRAGMA busy_timeout=30000")
+    _local.con, _local.path, _local.pid = con, DB_PATH, os.getpid()
+    return con
 
 def init_db():
     with _conn() as con:
@@ -27,31 +110,226 @@ def init_db():
             human_decision_at TEXT
         )
         """)
+        con.execute("CREATE INDEX IF NOT EXISTS idx_cases_created_at ON cases(created_at)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_cases_path ON cases(path)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_cases_human_decision ON cases(human_decision)")
+        existing = {r[1] for r in con.execute("PRAGMA table_info(cases)")}
+        # document_ref: artifact holding the text (document_text is only set on legacy rows);
+        # fts_ref: artifact currently in the full-text index (needed to delete it from a contentless index)
+        # archive_*: where an archived case's heavy columns live (see archive_cases)
+        int_columns = {"doc_id", "archive_offset"}
+        added = [
+            col for col in SUMMARY_COLUMNS + ["doc_id", "document_ref", "fts_ref",
+                                              "archive_segment", "archive_offset", "archived_at"]
+            if col not in existing
+        ]
+        for col in added:
+            con.execute(f"ALTER TABLE cases ADD COLUMN {col} {'INTEGER' if col in int_columns else 'TEXT'}")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_cases_document_ref ON cases(document_ref)")
+        # newest-first listing pages on (created_at, case_id)
+        con.execute("CREATE INDEX IF NOT EXISTS idx_cases_listing ON cases(created_at DESC, case_id DESC)")
+        con.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_cases_doc_id ON cases(doc_id)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_cases_client_email ON cases(client_email COLLATE NOCASE)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_cases_client_name ON cases(client_full_name COLLATE NOCASE)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_cases_sending ON cases(sending_institution COLLATE NOCASE)")
+        # search_cases compares these case-insensitively, which a BINARY index cannot serve;
+        # few distinct values, so created_at follows to return the newest matches without a sort
+        for old in ("idx_cases_types", "idx_cases_validation_status"):
+            con.execute(f"DROP INDEX IF EXISTS {old}")
+        for col in ("account_type", "transfer_type", "validation_status"):
+            con.execute(f"CREATE INDEX IF NOT EXISTS idx_cases_{col} ON cases({col} COLLATE NOCASE, created_at)")
+        # contentless full-text index over document text (the text itself stays in the artifact
+        # store); rowid = cases.doc_id (stable across VACUUM, unlike cases.rowid)
+        fts_sql = con.execute("SELECT sql FROM sqlite_master WHERE name='cases_fts'").fetchone()
+        if fts_sql and "content=''" not in fts_sql[0]:
+            con.execute("DROP TABLE cases_fts")
+            con.execute("UPDATE cases SET doc_id=NULL, fts_ref=NULL")
+        con.execute("CREATE VIRTUAL TABLE IF NOT EXISTS cases_fts USING fts5(document_text, content='')")
+        # single-row change counter bumped by triggers, so readers (the UI listing cache) can tell
+        # cheaply whether any process has written a case since they last looked
+        con.execute("CREATE TABLE IF NOT EXISTS cases_version (id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER)")
+        con.execute("INSERT OR IGNORE INTO cases_version(id, version) VALUES (1, 0)")
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            con.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_cases_version_{event.lower()} AFTER {event} ON cases
+            BEGIN UPDATE cases_version SET version = version + 1 WHERE id = 1; END
+            """)
+        # latest output of each checkpointed workflow step, keyed by a hash of the step's inputs
+        con.execute("""
+        CREATE TABLE IF NOT EXISTS step_checkpoints (
+            case_id TEXT,
+            step TEXT,
+            input_hash TEXT,
+            output_json TEXT,
+            created_at TEXT,
+            PRIMARY KEY (case_id, step)
+        )
+        """)
         con.commit()
+    _backfill_search_index(refresh_summary=any(col in SUMMARY_COLUMNS for col in added))
+    _backfill_archived_refs()
 
-def save_case(case_id: str, source_name: str, document_text: str, state: dict):
-    with _conn() as con:
+def _backfill_archived_refs():
+    """
+    Cases archived while document_ref was still an archived column have a NULL ref in
+    the slim row; restore it from the segment record.
+    """
+    con = _conn()
+    rows = con.execute("""
+        SELECT case_id, archive_segment, archive_offset FROM cases
+        WHERE archive_segment IS NOT NULL AND document_ref IS NULL
+    """).fetchall()
+    updates = []
+    for case_id, segment, offset in rows:
+        record = json.loads(case_archive().read(segment, offset))
+        ref = record.get("document_ref")
+        if ref is None and record.get("document_text") is not None:
+            ref = ArtifactStore.ref(record["document_text"])
+        if ref is not None:
+            updates.append((ref, case_id))
+    if updates:
+        with con:
+            con.executemany("UPDATE cases SET document_ref=? WHERE case_id=?", updates)
+
+def _backfill_search_index(*, refresh_summary: bool = False, chunk_size: int = 500):
+    """
+    Fill summary columns + FTS for rows saved before they existed, moving inline
+    document text into the artifact store on the way. With `refresh_summary` (a summary
+    column was just added), every row's summary columns are recomputed.
+    """
+    con = _conn()
+    store = artifact_store()
+    last = ""
+    while True:
+        rows = con.execute("""
+            SELECT case_id, document_text, document_ref, fields_json, validation_json, review_json, doc_id
+            FROM cases
+            WHERE case_id > ? AND (doc_id IS NULL OR document_text IS NOT NULL OR ?)
+            ORDER BY case_id LIMIT ?
+        """, (last, refresh_summary, chunk_size)).fetchall()
+        if not rows:
+            return
+        # artifacts are written on their own connection, before this chunk's transaction
+        inline = [r for r in rows if r[1] is not None]
+        moved = dict(zip((r[0] for r in inline), store.put_many(r[1] for r in inline)))
+        texts = store.get_many_text(r[2] for r in rows if r[6] is None and r[1] is None)
+        with con:
+            for case_id, document_text, document_ref, fields_json, validation_json, review_json, doc_id in rows:
+                state = {
+                    "fields": json.loads(fields_json) if fields_json else {},
+                    "validation": json.loads(validation_json) if validation_json else {},
+                    "review": json.loads(review_json) if review_json else {},
+                }
+                if case_id in moved:
+                    # legacy row: also re-serialize its JSON columns compactly
+                    document_ref = moved[case_id]
+                    con.execute("""
+                        UPDATE cases SET document_text=NULL, document_ref=?, fields_json=?, validation_json=?,
+                                         review_json=?
+                        WHERE case_id=?
+                    """, (document_ref, _dumps(_persisted_fields(state["fields"])), _dumps(state["validation"]),
+                          _dumps(state["review"]), case_id))
+                _write_summary(con, case_id, state)
+                if doc_id is None:
+                    text = document_text if document_text is not None else texts.get(document_ref, "")
+                    _write_fts(con, case_id, text, document_ref)
+        last = rows[-1][0]
+
+def _write_summary(con, case_id: str, state: dict):
+    summary = _summary(state)
+    con.execute(
+        f"UPDATE cases SET {', '.join(f'{k}=?' for k in summary)} WHERE case_id=?",
+        (*summary.values(), case_id),
+    )
+
+def _write_fts(con, case_id: str, document_text: str, document_ref: Optional[str]):
+    """
+    Refresh a case's FTS entry, assigning its doc_id on first index (caller owns the transaction).
+    Unchanged text (same ref) is not re-indexed.
+    """
+    doc_id, fts_ref = con.execute("SELECT doc_id, fts_ref FROM cases WHERE case_id=?", (case_id,)).fetchone()
+    if doc_id is not None and fts_ref is not None and fts_ref == document_ref:
+        return
+    if doc_id is None:
         con.execute("""
-        INSERT INTO cases(case_id, created_at, source_name, document_text, fields_json, validation_json, review_json, path, human_decision, human_decision_at)
-        VALUES(?,?,?,?,?,?,?,?,NULL,NULL)
-        ON CONFLICT(case_id) DO UPDATE SET
-            source_name=excluded.source_name,
-            document_text=excluded.document_text,
-            fields_json=excluded.fields_json,
-            validation_json=excluded.validation_json,
-            review_json=excluded.review_json,
-            path=excluded.path
-        """, (
+            UPDATE cases SET doc_id=(SELECT COALESCE(MAX(doc_id), 0) + 1 FROM cases)
+            WHERE case_id=?
+        """, (case_id,))
+        doc_id = con.execute("SELECT doc_id FROM cases WHERE case_id=?", (case_id,)).fetchone()[0]
+    elif fts_ref is not None:
+        # contentless index: removing a row needs the exact text that was indexed
+        old_text = artifact_store().get_text(fts_ref)
+        if old_text is None:
+            old_text = _archived_record(con, case_id).get("document_text") or ""
+        con.execute("INSERT INTO cases_fts(cases_fts, rowid, document_text) VALUES('delete', ?, ?)", (doc_id, old_text))
+    con.execute("INSERT INTO cases_fts(rowid, document_text) VALUES(?, ?)", (doc_id, document_text or ""))
+    con.execute("UPDATE cases SET fts_ref=? WHERE case_id=?", (document_ref, case_id))
+
+def save_case(case_id: str, source_name: str, document_text: str, state: dict):
+    save_cases([(case_id, source_name, document_text, state)])
+
+def save_cases(rows: Iterable[tuple[str, str, str, dict]]):
+    """
+    Upsert many (case_id, source_name, document_text, state) rows in one transaction.
+    Document text goes to the artifact store (deduplicated by hash) and the row keeps
+    its ref. Summary columns and the full-text index are kept in sync in the same transaction.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    con = _conn()
+    # take the write lock before touching artifacts, so archive_cases cannot drop a
+    # blob between our dedup check and the row that references it
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        refs = artifact_store().put_many((document_text or "" for _c, _s, document_text, _st in rows), con=con)
+        _upsert_cases(con, rows, refs)
+        con.commit()
+    except BaseException:
+        con.rollback()
+        raise
+
+def _upsert_cases(con, rows: list[tuple[str, str, str, dict]], refs: list[str]):
+    now = datetime.utcnow().isoformat()
+    params = [
+        (
             case_id,
-            datetime.utcnow().isoformat(),
+            now,
             source_name,
-            document_text,
-            json.dumps(state.get("fields", {}), indent=2),
-            json.dumps(state.get("validation", {}), indent=2),
-            json.dumps(state.get("review", {}), indent=2),
+            ref,
+            _dumps(_persisted_fields(state.get("fields", {}))),
+            _dumps(state.get("validation", {})),
+            _dumps(state.get("review", {})),
             state.get("path"),
-        ))
-        con.commit()
+        )
+        for (case_id, source_name, _text, state), ref in zip(rows, refs)
+    ]
+    con.executemany("""
+    INSERT INTO cases(case_id, created_at, source_name, document_ref, fields_json, validation_json, review_json, path, human_decision, human_decision_at)
+    VALUES(?,?,?,?,?,?,?,?,NULL,NULL)
+    ON CONFLICT(case_id) DO UPDATE SET
+        source_name=excluded.source_name,
+        document_text=NULL,
+        document_ref=excluded.document_ref,
+        fields_json=excluded.fields_json,
+        validation_json=excluded.validation_json,
+        review_json=excluded.review_json,
+        path=excluded.path,
+        -- a decision was made on the old document; a different (or unknown) one needs a new review
+        human_decision=CASE WHEN cases.document_ref IS excluded.document_ref
+                            THEN cases.human_decision ELSE NULL END,
+        human_decision_at=CASE WHEN cases.document_ref IS excluded.document_ref
+                               THEN cases.human_decision_at ELSE NULL END
+    """, params)
+    for (case_id, _source_name, document_text, state), ref in zip(rows, refs):
+        _write_summary(con, case_id, state)
+        _write_fts(con, case_id, document_text, ref)
+    # a re-saved archived case is hot again
+    con.executemany(
+        "UPDATE cases SET archive_segment=NULL, archive_offset=NULL, archived_at=NULL "
+        "WHERE case_id=? AND archive_segment IS NOT NULL",
+        [(case_id,) for case_id, *_ in rows],
+    )
 
 def set_human_decision(case_id: str, decision: str):
     with _conn() as con:
@@ -62,22 +340,321 @@ def set_human_decision(case_id: str, decision: str):
         """, (decision, datetime.utcnow().isoformat(), case_id))
         con.commit()
 
-def list_cases(limit: int = 20) -> list[dict]:
-    with _conn() as con:
-        cur = con.execute("""
-            SELECT case_id, created_at, source_name, path, human_decision, human_decision_at
-            FROM cases
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (limit,))
-        cols = [d[0] for d in cur.description]
-        return [dict(zip(cols, r)) for r in cur.fetchall()]
+def cases_version() -> int:
+    """
+    Monotonic counter bumped on every write to `cases` (by any process). Cache keys
+    built from it go stale exactly when the table changes.
+    """
+    return _conn().execute("SELECT version FROM cases_version WHERE id = 1").fetchone()[0]
+
+def list_cases(limit: int = 20, *, after: Optional[tuple[str, str]] = None) -> list[dict]:
+    """
+    Newest-first page of case summaries, read from the denormalized columns (no JSON).
+    Keyset pagination: pass the previous page's `next_cursor(page)` as `after`.
+    """
+    sql = f"""
+        SELECT case_id, created_at, source_name, path, human_decision, human_decision_at,
+               client_full_name, {", ".join(RESULT_COLUMNS)}
+        FROM cases
+    """
+    params: list = []
+    if after is not None:
+        sql += " WHERE (created_at, case_id) < (?, ?)"
+        params.extend(after)
+    sql += " ORDER BY created_at DESC, case_id DESC LIMIT ?"
+    params.append(limit)
+    cur = _conn().execute(sql, params)
+    cols = [d[0] for d in cur.description]
+    return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+def next_cursor(page: list[dict]) -> Optional[tuple[str, str]]:
+    return (page[-1]["created_at"], page[-1]["case_id"]) if page else None
+
+def _fts_query(text: str) -> str:
+    """
+    Free text -> FTS5 query: every word must appear (quoted, so user input cannot
+    break MATCH syntax); a trailing * keeps prefix search.
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+def _like_escape(value: str) -> str:
+    # match %, _ (and the escape character itself) literally, with ESCAPE '\'
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def search_cases(
+    query: str = "",
+    *,
+    client_email: Optional[str] = None,
+    client_name: Optional[str] = None,
+    sending_institution: Optional[str] = None,
+    account_type: Optional[str] = None,
+    transfer_type: Optional[str] = None,
+    validation_status: Optional[str] = None,
+    human_decision: Optional[str] = None,
+    limit: int = 50,
+) -> list[dict]:
+    """
+    Indexed case search. `query` is full-text over document_text (ranked by relevance);
+    the keyword filters hit the denormalized columns (case-insensitive; the institution
+    and name filters match on prefix). Without `query`, newest cases come first.
+    """
+    where: list[str] = []
+    params: list = []
+    # match: "prefix" (LIKE), "nocase" (= over a NOCASE index) or "upper" (values the app
+    # always stores upper-case, compared on the column's BINARY index)
+    for col, value, match in (
+        ("client_email", client_email, "nocase"),
+        ("client_full_name", client_name, "prefix"),
+        ("sending_institution", sending_institution, "prefix"),
+        ("account_type", account_type, "nocase"),
+        ("transfer_type", transfer_type, "nocase"),
+        ("validation_status", validation_status, "nocase"),
+        ("human_decision", human_decision, "upper"),
+    ):
+        if value:
+            if match == "prefix":
+                where.append(f"c.{col} LIKE ? ESCAPE '\\'")
+                params.append(_like_escape(value.strip()) + "%")
+            elif match == "upper":
+                where.append(f"c.{col} = ?")
+                params.append(value.strip().upper())
+            else:
+                where.append(f"c.{col} = ? COLLATE NOCASE")
+                params.append(value.strip())
+
+    select = f"""
+        SELECT c.case_id, c.created_at, c.source_name, c.path, c.human_decision,
+               {", ".join(f"c.{k}" for k in SUMMARY_COLUMNS)}
+        FROM cases c
+    """
+    fts = _fts_query(query or "")
+    if fts:
+        sql = select + " JOIN cases_fts f ON f.rowid = c.doc_id WHERE cases_fts MATCH ?"
+        params.insert(0, fts)
+        sql += "".join(f" AND {w}" for w in where) + " ORDER BY f.rank LIMIT ?"
+    else:
+        sql = select + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY c.created_at DESC LIMIT ?"
+    params.append(limit)
+
+    cur = _conn().execute(sql, params)
+    cols = [d[0] for d in cur.description]
+    return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+def _resolve_text(rows: list[dict]) -> None:
+    # fill document_text from the artifact store for rows that only hold a ref
+    refs = [r.get("document_ref") for r in rows if r.get("document_text") is None]
+    if not any(refs):
+        return
+    texts = artifact_store().get_many_text(refs)
+    for r in rows:
+        if r.get("document_text") is None and r.get("document_ref"):
+            r["document_text"] = texts.get(r["document_ref"])
+
+def _archived_record(con, case_id: str) -> dict:
+    row = con.execute("SELECT archive_segment, archive_offset FROM cases WHERE case_id=?", (case_id,)).fetchone()
+    if not row or row[0] is None:
+        return {}
+    return json.loads(case_archive().read(row[0], row[1]))
 
 def get_case(case_id: str) -> Optional[dict]:
+    """
+    Full case row. Archived cases are transparently re-hydrated from their segment.
+    """
     with _conn() as con:
         cur = con.execute("SELECT * FROM cases WHERE case_id=?", (case_id,))
         row = cur.fetchone()
         if not row:
             return None
         cols = [d[0] for d in cur.description]
-        return dict(zip(cols, row))
\ No newline at end of file
+        case = dict(zip(cols, row))
+    if case.get("archive_segment"):
+        record = json.loads(case_archive().read(case["archive_segment"], case["archive_offset"]))
+        for key in ARCHIVED_COLUMNS:
+            case[key] = record.get(key)
+    _resolve_text([case])
+    return case
+
+def iter_cases(columns: Iterable[str] = ("case_id", "fields_json", "validation_json", "review_json", "path"),
+               chunk_size: int = 500) -> Iterator[list[dict]]:
+    """
+    Stream all hot (non-archived) cases in case_id order, `chunk_size` rows at a time
+    (keyset pagination, so memory stays flat however large the table is). Requesting
+    "document_text" loads it from the artifact store.
+    """
+    cols = list(columns)
+    if "case_id" not in cols:
+        cols.insert(0, "case_id")
+    with_text = "document_text" in cols and "document_ref" not in cols
+    if with_text:
+        cols.append("document_ref")
+    select = ", ".join(cols)
+    last = ""
+    while True:
+        cur = _conn().execute(
+            f"SELECT {select} FROM cases WHERE case_id > ? AND archive_segment IS NULL ORDER BY case_id LIMIT ?",
+            (last, chunk_size),
+        )
+        names = [d[0] for d in cur.description]
+        rows = [dict(zip(names, r)) for r in cur.fetchall()]
+        if not rows:
+            return
+        if "document_text" in cols:
+            _resolve_text(rows)
+        if with_text:
+            for r in rows:
+                del r["document_ref"]
+        yield rows
+        last = rows[-1]["case_id"]
+
+def update_case_results(rows: Iterable[tuple[str, dict, dict, Optional[str]]]):
+    """
+    Overwrite (validation, review, path) for existing cases in one transaction.
+    rows: (case_id, validation, review, path)
+    """
+    rows = list(rows)
+    params = [(_dumps(validation), _dumps(review), path, case_id) for case_id, validation, review, path in rows]
+    if not params:
+        return
+    with _conn() as con:
+        con.executemany("UPDATE cases SET validation_json=?, review_json=?, path=? WHERE case_id=?", params)
+        for case_id, validation, review, _path in rows:
+            _write_summary(con, case_id, {"validation": validation, "review": review})
+        con.commit()
+
+def archive_candidates(*, older_than: Optional[datetime] = None,
+                       final_decisions: Iterable[str] = FINAL_DECISIONS, limit: int = 500) -> list[str]:
+    """
+    Oldest hot cases created before `older_than` or closed by a final human decision.
+    """
+    where = []
+    params: list = []
+    if older_than is not None:
+        where.append("created_at < ?")
+        params.append(older_than.isoformat())
+    decisions = list(final_decisions)
+    if decisions:
+        where.append(f"human_decision IN ({','.join('?' * len(decisions))})")
+        params.extend(decisions)
+    if not where:
+        return []
+    params.append(limit)
+    cur = _conn().execute(f"""
+        SELECT case_id FROM cases
+        WHERE archive_segment IS NULL AND ({" OR ".join(where)})
+        ORDER BY created_at LIMIT ?
+    """, params)
+    return [r[0] for r in cur.fetchall()]
+
+def count_archived_cases() -> int:
+    return _conn().execute("SELECT COUNT(*) FROM cases WHERE archive_segment IS NOT NULL").fetchone()[0]
+
+def archive_cases(case_ids: Iterable[str], *, keep_refs: Iterable[str] = ()) -> int:
+    """
+    Move the heavy columns (document text, fields/validation/review JSON) of these cases
+    into the monthly segment of their created_at and leave a slim row: summary columns,
+    decision and full-text entry stay searchable, `get_case` reads the rest back.
+    Step checkpoints are dropped and artifacts no other case references are deleted,
+    except those in `keep_refs` (e.g. held by queued jobs) or stored within ARTIFACT_GRACE_S.
+    Returns the number of cases archived.
+    """
+    keep_refs = set(keep_refs)
+    case_ids = list(dict.fromkeys(case_ids))
+    if not case_ids:
+        return 0
+    con = _conn()
+    store = artifact_store()
+    archive = case_archive()
+    marks = ",".join("?" * len(case_ids))
+    # holding the write lock also serializes appends to the segments
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        rows = con.execute(f"""
+            SELECT case_id, created_at, document_text, document_ref, fields_json, validation_json, review_json
+            FROM cases WHERE case_id IN ({marks}) AND archive_segment IS NULL
+        """, case_ids).fetchall()
+        texts = store.get_many_text(r[3] for r in rows if r[2] is None)
+        by_segment: dict[str, list[tuple]] = {}
+        for row in rows:
+            by_segment.setdefault(f"cases-{(row[1] or '0000-00')[:7]}.seg", []).append(row)
+
+        now = datetime.utcnow().isoformat()
+        updates = []
+        for segment, group in by_segment.items():
+            records = [
+                json.dumps({
+                    "case_id": case_id,
+                    "document_ref": document_ref,
+                    "document_text": document_text if document_text is not None else texts.get(document_ref),
+                    "fields_json": fields_json,
+                    "validation_json": validation_json,
+                    "review_json": review_json,
+                }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                for case_id, _created, document_text, document_ref, fields_json, validation_json, review_json in group
+            ]
+            offsets = archive.append(segment, records)
+            updates.extend((segment, offset, now, row[0]) for row, offset in zip(group, offsets))
+
+        con.executemany(f"""
+            UPDATE cases SET {", ".join(f"{c}=NULL" for c in ARCHIVED_COLUMNS)},
+                   archive_segment=?, archive_offset=?, archived_at=?
+            WHERE case_id=?
+        """, updates)
+        con.execute(f"DELETE FROM step_checkpoints WHERE case_id IN ({marks})", case_ids)
+        refs = list({r[3] for r in rows if r[3]} - keep_refs)
+        orphaned = [
+            ref for ref in refs
+            # archived rows keep their ref but their text is in the segment
+            if con.execute("SELECT 1 FROM cases WHERE document_ref=? AND archive_segment IS NULL LIMIT 1",
+                           (ref,)).fetchone() is None
+        ]
+        store.delete(orphaned, con=con, stored_before=time.time() - ARTIFACT_GRACE_S)
+        con.commit()
+    except BaseException:
+        con.rollback()
+        raise
+    return len(updates)
+
+def compact_db() -> int:
+    """
+    VACUUM the hot database (returning space freed by archiving to the OS); returns its size in bytes.
+    """
+    con = _conn()
+    con.execute("VACUUM")
+    con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return os.path.getsize(DB_PATH)
+
+class CaseCheckpoints:
+    """
+    StepGraph checkpoint store backed by the case database (one row per case + step).
+    A stored output is reused only while the step's input hash is unchanged.
+    """
+
+    def __init__(self, case_id: str):
+        self.case_id = case_id
+
+    def load(self, step: str, input_hash: str) -> tuple[bool, object]:
+        row = _conn().execute(
+            "SELECT output_json FROM step_checkpoints WHERE case_id=? AND step=? AND input_hash=?",
+            (self.case_id, step, input_hash),
+        ).fetchone()
+        if row is None:
+            return False, None
+        return True, json.loads(row[0])
+
+    def save(self, step: str, input_hash: str, output) -> None:
+        with _conn() as con:
+            con.execute("""
+            INSERT INTO step_checkpoints(case_id, step, input_hash, output_json, created_at)
+            VALUES(?,?,?,?,?)
+            ON CONFLICT(case_id, step) DO UPDATE SET
+                input_hash=excluded.input_hash,
+                output_json=excluded.output_json,
+                created_at=excluded.created_at
+            """, (self.case_id, step, input_hash, _dumps(output), datetime.utcnow().isoformat()))
+            con.commit()
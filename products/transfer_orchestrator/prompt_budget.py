@@ -0,0 +1,169 @@
+"""
+Token-budgeted document text for extraction prompts.
+
+Long packages (forms plus statements, IDs, attachments) are split into sections, each
+section is scored by how many schema fields its wording points at, and only the best
+sections that fit the token budget are sent. `chunk_sections` packs a document into
+budget-sized chunks for map-reduce extraction, and `merge_partial_fields` combines
+the per-chunk answers.
+
+Token counts are a local estimate (no tokenizer dependency); it errs on the high side
+for English text, so a budget is an upper bound on what the API will count.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Iterable
+
+_PIECE_RE = re.compile(r"\d+|[^\W\d_]+|_+|[^\w\s]", re.UNICODE)
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+# marks where unselected text was dropped
+GAP = "\n[...]\n"
+
+# enum placeholders that mean "not found" rather than a value
+UNKNOWN_VALUES = {"UNKNOWN"}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate BPE token count: letters ~6 chars/token, digits ~3, punctuation 1 each.
+    Never more than one token per character.
+    """
+    n = 0
+    for piece in _PIECE_RE.findall(text):
+        n += 1 + (len(piece) - 1) // (3 if piece[0].isdigit() else 6)
+    return n
+
+
+def _cut(text: str, max_tokens: int) -> list[str]:
+    # estimate_tokens <= len(text), so pieces of max_tokens chars always fit
+    return [text[i:i + max_tokens] for i in range(0, len(text), max_tokens)]
+
+
+def split_sections(text: str, *, max_tokens: int) -> list[str]:
+    """
+    Paragraphs (blank-line separated; pages end up as separate paragraphs), with any
+    paragraph over `max_tokens` split on line boundaries (and over-long lines cut).
+    """
+    sections: list[str] = []
+    for para in _PARAGRAPH_RE.split(text):
+        if not para.strip():
+            continue
+        if estimate_tokens(para) <= max_tokens:
+            sections.append(para)
+            continue
+        lines: list[str] = []
+        used = 0
+        for line in para.split("\n"):
+            for piece in _cut(line, max_tokens) if estimate_tokens(line) > max_tokens else [line]:
+                t = estimate_tokens(piece) + 1
+                if lines and used + t > max_tokens:
+                    sections.append("\n".join(lines))
+                    lines, used = [], 0
+                lines.append(piece)
+                used += t
+        if lines:
+            sections.append("\n".join(lines))
+    return sections
+
+
+def keyword_scorer(keywords: dict[str, Iterable[str]],
+                   patterns: Iterable[re.Pattern] = ()) -> Callable[[str], float]:
+    """
+    Section score = number of fields whose keywords appear (case-insensitive) plus the
+    number of `patterns` that match, so sections touching many fields rank first.
+    """
+    kw = {field: tuple(k.lower() for k in words) for field, words in keywords.items()}
+    pats = list(patterns)
+
+    def score(section: str) -> float:
+        low = section.lower()
+        return sum(1 for words in kw.values() if any(k in low for k in words)) + sum(
+            1 for p in pats if p.search(section)
+        )
+
+    return score
+
+
+def _ranked(scores: list[float]) -> list[int]:
+    # best score first; document order among equals. Without any hit, keep document order.
+    if not any(scores):
+        return list(range(len(scores)))
+    return [i for i in sorted(range(len(scores)), key=lambda i: (-scores[i], i)) if scores[i] > 0]
+
+
+def select_sections(text: str, *, budget_tokens: int, score: Callable[[str], float]) -> tuple[str, dict]:
+    """
+    The highest-scoring sections that fit in `budget_tokens`, re-joined in document order.
+    Returns (text, info) where info has the estimated tokens before/after and section counts.
+    """
+    total = estimate_tokens(text)
+    if total <= budget_tokens:
+        return text, {"tokens_in": total, "tokens_out": total, "sections": None, "kept": None}
+
+    sections = split_sections(text, max_tokens=budget_tokens)
+    sizes = [estimate_tokens(s) for s in sections]
+    scores = [score(s) for s in sections]
+    gap = estimate_tokens(GAP)
+    kept: set[int] = set()
+    used = 0
+    for i in _ranked(scores):
+        if used + sizes[i] + gap <= budget_tokens:
+            kept.add(i)
+            used += sizes[i] + gap
+
+    parts: list[str] = []
+    for i in sorted(kept):
+        if parts and i - 1 not in kept:
+            parts.append(GAP.strip())
+        parts.append(sections[i])
+    out = "\n\n".join(parts)
+    return out, {"tokens_in": total, "tokens_out": estimate_tokens(out), "sections": len(sections), "kept": len(kept)}
+
+
+def chunk_sections(text: str, *, budget_tokens: int, max_chunks: int,
+                   score: Callable[[str], float]) -> list[str]:
+    """
+    Pack sections, in order, into chunks of at most `budget_tokens`; keep the `max_chunks`
+    best-scoring chunks (in document order) so the number of calls is bounded.
+    """
+    sections = split_sections(text, max_tokens=budget_tokens)
+    chunks: list[list[str]] = []
+    used = 0
+    for section in sections:
+        t = estimate_tokens(section) + 1
+        if not chunks or used + t > budget_tokens:
+            chunks.append([])
+            used = 0
+        chunks[-1].append(section)
+        used += t
+    joined = ["\n\n".join(c) for c in chunks]
+    keep = sorted(_ranked([score(c) for c in joined])[:max_chunks])
+    return [joined[i] for i in keep]
+
+
+def _comparable(value: Any) -> Any:
+    return " ".join(value.split()).casefold() if isinstance(value, str) else value
+
+
+def merge_partial_fields(partials: list[dict], *, enum_fields: Iterable[str] = ()) -> dict:
+    """
+    Reduce step: combine per-chunk extractions. A field takes the value the chunks
+    agree on (ignoring null/UNKNOWN answers); when chunks give conflicting values it
+    becomes null (UNKNOWN for `enum_fields`), matching the never-guess rule.
+    """
+    enum_fields = set(enum_fields)
+    merged: dict[str, Any] = {}
+    keys = list(dict.fromkeys(k for p in partials for k in p))
+    for key in keys:
+        answers = [p.get(key) for p in partials]
+        found = [v for v in answers if v is not None and not (isinstance(v, str) and v in UNKNOWN_VALUES)]
+        if not found:
+            merged[key] = next((v for v in answers if v is not None), None)
+            continue
+        if len({_comparable(v) for v in found}) == 1:
+            merged[key] = found[0]
+        else:
+            merged[key] = "UNKNOWN" if key in enum_fields else None
+    return merged
@@ -16,7 +16,7 @@ EXTRACT_USER = """Return JSON matching this schema exactly:
   "sending_institution": string|null,
   "receiving_institution": string|null,
   "transfer_type": "FULL"|"PARTIAL"|"UNKNOWN",
-  "transfer_method": "CASH"|"IN_KIND"|"UNKOWN",
+  "transfer_method": "CASH"|"IN_KIND"|"UNKNOWN",
   "account_type": "TFSA"|"RRSP"|"FHSA"|"NON_REGISTERED"|"UNKNOWN",
   "account_number_last4": string|null,
   "requested_date": string|null,
@@ -54,4 +54,46 @@ Return JSON:
      "why": string
   }}
 }}
-"""
\ No newline at end of file
+"""
+# Single-call mode: extraction and a draft review in one response. The draft is written
+# against the model's own reading of the fields; deterministic validation still runs after.
+COMBINED_SYSTEM = EXTRACT_SYSTEM + " " + REVIEW_SYSTEM
+
+COMBINED_USER = """Extract the transfer fields from the text below, then draft the case review for them.
+
+TEXT:
+---
+{document_text}
+---
+
+Return JSON:
+{{
+  "fields": {{
+    "client_full_name": string|null,
+    "client_email": string|null,
+    "client_phone": string|null,
+    "sending_institution": string|null,
+    "receiving_institution": string|null,
+    "transfer_type": "FULL"|"PARTIAL"|"UNKNOWN",
+    "transfer_method": "CASH"|"IN_KIND"|"UNKNOWN",
+    "account_type": "TFSA"|"RRSP"|"FHSA"|"NON_REGISTERED"|"UNKNOWN",
+    "account_number_last4": string|null,
+    "requested_date": string|null,
+    "has_signature": boolean|null
+  }},
+  "review": {{
+    "assumed_status": "PASS"|"WARN"|"FAIL",
+    "case_summary": string,
+    "checklist": [string],
+    "recommended_next_step": "REQUEST_INFO"|"ESCALATE"|"READY_FOR_HUMAN_APPROVAL",
+    "customer_message_draft": string,
+    "internal_note": string,
+    "human_must_decide": {{
+       "decision": "APPROVE_TO_PROCEED",
+       "why": string
+    }}
+  }}
+}}
+"assumed_status" is PASS only if every field is present, unambiguous and the document is signed;
+FAIL if a required field is missing or the signature is explicitly missing; otherwise WARN.
+"""
@@ -0,0 +1,124 @@
+"""
+Re-run recorded cases against a cassette of LLM responses, at CPU speed.
+
+Record production traffic with LLM_CASSETTE_MODE=record (see core.llm_client.get_llm_client),
+then re-run `TransferAgent` over those cases - hot or archived - with every LLM call served
+from the cassette. Nothing is written to the case store. With --compare, replayed
+validation status and gate decision are diffed against what is stored, which is the
+regression check for prompt, validation and gating changes.
+
+Usage:
+    python -m products.transfer_orchestrator.replay "data/cassettes/llm-*.jsonl.gz" --compare
+    python -m products.transfer_orchestrator.replay cassette.jsonl.gz --cases c1 c2 --strict
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from core.call_context import bind, case_id_var
+from core.config import load_config
+from core.llm_cassette import ReplayLLMClient
+from core.metrics import ToolMetrics
+
+from products.transfer_orchestrator.db import get_case, init_db
+from products.transfer_orchestrator.workflow import build_router
+
+
+def _stored(case: dict) -> tuple[str | None, str | None]:
+    validation = json.loads(case.get("validation_json") or "{}")
+    review = json.loads(case.get("review_json") or "{}")
+    return validation.get("status"), (review.get("human_must_decide") or {}).get("decision")
+
+
+def replay_case(llm: ReplayLLMClient, case_id: str, *, metrics: ToolMetrics | None = None) -> dict:
+    case = get_case(case_id)
+    if case is None or case.get("document_text") is None:
+        return {"case_id": case_id, "status": "MISSING"}
+    router, _ = build_router(llm, metrics=metrics)
+    # no case_id in the payload: checkpoints would short-circuit the LLM steps;
+    # the ID is still bound so the cassette can match on it
+    with bind(case_id_var, case_id):
+        try:
+            state = router.route({"document_text": case["document_text"]})
+        except Exception as e:
+            return {"case_id": case_id, "status": "ERROR", "error": repr(e)}
+    status, decision = _stored(case)
+    return {
+        "case_id": case_id,
+        "status": "OK",
+        "validation": (state.get("validation") or {}).get("status"),
+        "decision": (state.get("review") or {}).get("human_must_decide", {}).get("decision"),
+        "stored_validation": status,
+        "stored_decision": decision,
+    }
+
+
+def replay_all(cassette: str, *, case_ids: list[str] | None = None, concurrency: int = 8,
+               strict: bool = False, compare: bool = False, out=sys.stdout) -> dict:
+    init_db()
+    llm = ReplayLLMClient(cassette, strict=strict)
+    case_ids = case_ids or llm.case_ids
+    metrics = ToolMetrics(window=max(1, len(case_ids)))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        results = list(pool.map(lambda cid: replay_case(llm, cid, metrics=metrics), case_ids))
+    elapsed = time.perf_counter() - started
+
+    outcomes = Counter(r["status"] for r in results)
+    ok = [r for r in results if r["status"] == "OK"]
+    diffs = [
+        r for r in ok
+        if (r["validation"], r["decision"]) != (r["stored_validation"], r["stored_decision"])
+    ]
+    rate = len(results) / elapsed if elapsed > 0 else 0.0
+    print(f"Replayed {len(results)} cases in {elapsed:.2f}s ({rate:.0f} cases/s): "
+          f"{dict(outcomes)}; LLM {dict(llm.stats)}", file=out)
+    for r in results:
+        if r["status"] == "ERROR":
+            print(f"  {r['case_id']}: {r['error']}", file=out)
+    if compare:
+        print(f"{len(diffs)} of {len(ok)} cases differ from the stored result", file=out)
+        transitions = Counter(
+            (f"{r['stored_validation']}/{r['stored_decision']}", f"{r['validation']}/{r['decision']}") for r in diffs
+        )
+        for (old, new), n in transitions.most_common():
+            print(f"  {old} -> {new}: {n}", file=out)
+
+    return {
+        "cases": len(results),
+        "elapsed_s": round(elapsed, 3),
+        "cases_per_s": round(rate, 1),
+        "outcomes": dict(outcomes),
+        "llm": dict(llm.stats),
+        "differences": [r["case_id"] for r in diffs] if compare else None,
+        "tools": metrics.snapshot(),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-run recorded cases with LLM responses served from a cassette.")
+    parser.add_argument("cassette", help="cassette path or glob (quote it)")
+    parser.add_argument("--cases", nargs="*", help="case IDs to replay (default: every case in the cassette)")
+    parser.add_argument("--concurrency", type=int, default=8, help="cases replayed in parallel")
+    parser.add_argument("--strict", action="store_true",
+                        help="only serve exact request matches (fail on any prompt change)")
+    parser.add_argument("--compare", action="store_true", help="diff validation/decision against the stored cases")
+    parser.add_argument("--out", help="write the JSON report here")
+    args = parser.parse_args(argv)
+    load_config()
+    report = replay_all(args.cassette, case_ids=args.cases, concurrency=args.concurrency,
+                        strict=args.strict, compare=args.compare)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["outcomes"].get("ERROR") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Offline re-validation and re-gating of stored cases. Never calls the LLM.
+
+After a change to `validate_fields` or to the deterministic gating in
+`apply_decision_gate`, the stored validation_json / review_json / path are stale.
+This streams every case out of the store in chunks, recomputes validation
+(vectorized) and the human_must_decide override from the stored fields and review,
+and writes back only the rows that changed, one transaction per chunk.
+Reviews saved before `model_recommended_next_step` existed are gated on their stored
+recommended_next_step and keep no model recommendation (it was never recorded).
+
+Archived cases (see archive.py) are not re-gated: their results live in read-only
+segments. They are counted in the output; un-archive a case by re-saving it (e.g.
+re-running it) to bring it under the current rules.
+
+Usage:
+    python -m products.transfer_orchestrator.revalidate --dry-run
+    python -m products.transfer_orchestrator.revalidate --chunk-size 2000
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import sys
+import time
+from collections import Counter
+
+from core.config import load_config
+
+from products.transfer_orchestrator.db import count_archived_cases, init_db, iter_cases, update_case_results
+from products.transfer_orchestrator.tools import apply_decision_gate
+from products.transfer_orchestrator.workflow import route_for_validation
+
+
+def _loads(raw: str | None) -> dict:
+    return json.loads(raw) if raw else {}
+
+
+def _decision(review: dict) -> str | None:
+    return (review.get("human_must_decide") or {}).get("decision")
+
+
+def revalidate_chunk(rows: list[dict]) -> tuple[list[tuple[str, dict, dict, str]], Counter, Counter]:
+    """
+    Recompute (validation, review, path) for a chunk of stored cases.
+    Returns (changed rows for update_case_results, status transitions, decision transitions).
+    """
+    # pandas/numpy load on first use, not when the CLI starts
+    from products.transfer_orchestrator.validation_batch import validate_fields_batch
+
+    # source text comes from the case's document (older rows also kept it in fields_json)
+    fields = []
+    for r in rows:
+        f = _loads(r["fields_json"])
+        if r.get("document_text") is not None:
+            f["_raw_text"] = r["document_text"]
+        fields.append(f)
+    validations = validate_fields_batch(fields).to_dict("records")
+
+    changed: list[tuple[str, dict, dict, str]] = []
+    status_changes: Counter = Counter()
+    decision_changes: Counter = Counter()
+
+    for row, validation in zip(rows, validations):
+        old_validation = _loads(row["validation_json"])
+        old_review = _loads(row["review_json"])
+
+        # cases saved without a review keep having none; only validation/path are refreshed
+        review = apply_decision_gate(copy.deepcopy(old_review), validation) if old_review else old_review
+        path = route_for_validation(validation)
+
+        if validation == old_validation and review == old_review and path == row["path"]:
+            continue
+        changed.append((row["case_id"], validation, review, path))
+        if validation.get("status") != old_validation.get("status"):
+            status_changes[(old_validation.get("status"), validation.get("status"))] += 1
+        if _decision(review) != _decision(old_review):
+            decision_changes[(_decision(old_review), _decision(review))] += 1
+
+    return changed, status_changes, decision_changes
+
+
+def revalidate_all(*, chunk_size: int = 1000, dry_run: bool = False, out=sys.stdout) -> dict:
+    init_db()
+    started = time.perf_counter()
+    scanned = 0
+    updated = 0
+    status_changes: Counter = Counter()
+    decision_changes: Counter = Counter()
+
+    columns = ("case_id", "document_text", "fields_json", "validation_json", "review_json", "path")
+    for rows in iter_cases(columns, chunk_size=chunk_size):
+        changed, statuses, decisions = revalidate_chunk(rows)
+        if changed and not dry_run:
+            update_case_results(changed)
+        scanned += len(rows)
+        updated += len(changed)
+        status_changes.update(statuses)
+        decision_changes.update(decisions)
+        print(f"scanned {scanned}, changed {updated}", file=out, flush=True)
+
+    archived = count_archived_cases()
+    elapsed = time.perf_counter() - started
+    verb = "would change" if dry_run else "changed"
+    print(f"Done in {elapsed:.1f}s: {scanned} cases scanned, {updated} {verb}, "
+          f"{sum(decision_changes.values())} decisions changed", file=out)
+    if archived:
+        print(f"  {archived} archived cases skipped (not re-gated)", file=out)
+    for (old, new), n in decision_changes.most_common():
+        print(f"  decision {old} -> {new}: {n}", file=out)
+    for (old, new), n in status_changes.most_common():
+        print(f"  validation {old} -> {new}: {n}", file=out)
+
+    return {
+        "scanned": scanned,
+        "changed": updated,
+        "archived_skipped": archived,
+        "decisions_changed": sum(decision_changes.values()),
+        "decision_transitions": {f"{o}->{n}": c for (o, n), c in decision_changes.items()},
+        "status_transitions": {f"{o}->{n}": c for (o, n), c in status_changes.items()},
+        "dry_run": dry_run,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-run deterministic validation and gating on stored cases.")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="cases per read/write batch")
+    parser.add_argument("--dry-run", action="store_true", help="report changes without writing them")
+    args = parser.parse_args(argv)
+    load_config()
+    revalidate_all(chunk_size=args.chunk_size, dry_run=args.dry_run)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,211 @@
 from __future__ import annotations
+import contextvars
+import functools
+import json
+import os
 import re
-from typing import Any, Dict
-import pdfplumber
-from products.transfer_orchestrator.prompts import EXTRACT_SYSTEM, EXTRACT_USER, REVIEW_SYSTEM, REVIEW_USER
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional
+from products.transfer_orchestrator.prompt_budget import (
+    chunk_sections,
+    estimate_tokens,
+    keyword_scorer,
+    merge_partial_fields,
+    select_sections,
+)
+from products.transfer_orchestrator.prompts import (
+    COMBINED_SYSTEM,
+    COMBINED_USER,
+    EXTRACT_SYSTEM,
+    EXTRACT_USER,
+    REVIEW_SYSTEM,
+    REVIEW_USER,
+)
 
 
 EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 PHONE_RE = re.compile(r"^\+?[\d\-\s\(\)]+$")
 LAST4_RE = re.compile(r"^\d{4}$")
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Characters that signal OCR noise / garbage in source text and names
+WEIRD_CHARS = "@#$%^&*_=+~<>"
+
+# Fields validate_fields treats as mandatory; the rule fast path must fill all of them to skip the LLM.
+REQUIRED_FIELDS = [
+    "client_full_name",
+    "receiving_institution",
+    "transfer_type",
+    "account_type",
+]
+
+# A streamed PDF may stop once these are all found. The signature is not required, but a
+# "not signed" line fails validation and often sits on a later page than the rest.
+EARLY_EXIT_FIELDS = REQUIRED_FIELDS + ["has_signature"]
+
+# "Label: value" lines on machine-generated forms -> schema field
+FIELD_LABELS: dict[str, tuple[str, ...]] = {
+    "client_full_name": ("client full name", "client name", "full name", "name", "account holder"),
+    "client_email": ("client email", "email address", "email", "e-mail"),
+    "client_phone": ("client phone", "phone number", "phone", "telephone"),
+    "sending_institution": ("sending institution", "delivering institution", "from institution", "transfer from"),
+    "receiving_institution": ("receiving institution", "to institution", "transfer to"),
+    "transfer_type": ("transfer type",),
+    "account_type": ("account type",),
+    "account_number_last4": ("account number last 4", "account last 4", "last 4 digits", "last 4", "last4"),
+    "requested_date": ("requested date", "date requested", "transfer date"),
+    "has_signature": ("signature", "client signature"),
+}
+_LABEL_TO_FIELD = {label: field for field, labels in FIELD_LABELS.items() for label in labels}
+LABEL_LINE_RE = re.compile(
+    r"^\s*(" + "|".join(sorted((re.escape(l) for l in _LABEL_TO_FIELD), key=len, reverse=True)) + r")\s*[:\-]\s*(.+?)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+TRANSFER_TYPE_VALUES = {"full": "FULL", "partial": "PARTIAL"}
+ACCOUNT_TYPE_VALUES = {
+    "tfsa": "TFSA",
+    "rrsp": "RRSP",
+    "fhsa": "FHSA",
+    "non-registered": "NON_REGISTERED",
+    "non registered": "NON_REGISTERED",
+    "non_registered": "NON_REGISTERED",
+}
+# Only explicit wording counts; shorthand like "Signed: y" is left to the LLM (which returns null).
+SIGNATURE_VALUES = {
+    "present": True,
+    "signed": True,
+    "signed by client": True,
+    "signature present": True,
+    "missing": False,
+    "absent": False,
+    "not signed": False,
+    "none": False,
+}
+
+
+# Extraction prompt budget (estimated tokens of document text per LLM call) and what to do
+# with documents over it: "select" sends the best-scoring sections in one call,
+# "map_reduce" extracts from up to EXTRACT_MAX_CHUNKS chunks concurrently and merges.
+EXTRACT_TOKEN_BUDGET = 6000
+EXTRACT_LONG_MODE = "select"
+EXTRACT_MAX_CHUNKS = 6
+ENUM_FIELDS = ("transfer_type", "transfer_method", "account_type")
+
+# Wording that points at a schema field; sections mentioning many of these are kept first.
+_SECTION_SCORER = keyword_scorer(
+    {
+        **FIELD_LABELS,
+        "institution": ("institution", "brokerage", "bank", "trust company", "investing"),
+        "transfer": ("transfer", "in-kind", "in kind", "in cash"),
+        "account_type": ("tfsa", "rrsp", "fhsa", "non-registered", "account type"),
+    },
+    [re.compile(r"[^@\s]+@[^@\s]+\.\w+"), re.compile(r"\d{4}-\d{2}-\d{2}")],
+)
+
+# Below this many pages, handing ranges to worker processes (pickling, a second open of
+# the PDF per worker) costs more than the layout analysis it saves.
+PARALLEL_MIN_PAGES = 8
+
+_pdf_pool: ProcessPoolExecutor | None = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """
+    Process-wide pool for page extraction, started once and reused by every document.
+    Workers are spawned, not forked: callers are multithreaded (batch, Streamlit), and a
+    forked child can inherit a lock some other thread held at the time.
+    """
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            import multiprocessing as mp
+
+            _pdf_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=mp.get_context("spawn"))
+        return _pdf_pool
 
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> list[str]:
+    """
+    Worker: extract pages [start, stop) with one open of the PDF.
+    """
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return [pdf.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def extract_text_from_pdf(pdf_path: str, *, workers: int | None = 1,
+                          min_pages_parallel: int = PARALLEL_MIN_PAGES) -> str:
     """
     Extract text from a text-based PDF.
     NOTE: Scanned PDFs will likely return empty text.
+
+    workers: processes used for page layout analysis (None = all cores). Pages are split
+    into contiguous ranges, one per worker, run on the shared pool (_get_pdf_pool) and
+    re-joined in page order. Documents shorter than `min_pages_parallel` (or workers <= 1)
+    use the sequential path.
     """
-    chunks: list[str] = []
+    # pdfplumber (and pdfminer) only load when a PDF is actually read
+    import pdfplumber
+
+    workers = workers or os.cpu_count() or 1
+    with pdfplumber.open(pdf_path) as pdf:
+        n_pages = len(pdf.pages)
+        if workers <= 1 or n_pages < max(min_pages_parallel, 2):
+            pages = [page.extract_text() or "" for page in pdf.pages]
+        else:
+            pages = None
+
+    if pages is None:
+        workers = min(workers, n_pages)
+        step = -(-n_pages // workers)
+        bounds = [(i, min(i + step, n_pages)) for i in range(0, n_pages, step)]
+        futures = [_get_pdf_pool().submit(_extract_page_range, pdf_path, a, b) for a, b in bounds]
+        pages = [t for fut in futures for t in fut.result()]
+
+    chunks = [t for t in pages if t.strip()]
+    return "\n\n".join(chunks).strip()
+
+
+def iter_pdf_pages(pdf_path: str, *, max_pages: int | None = None) -> Iterator[str]:
+    """
+    Yield page texts one at a time (in order), releasing each page's layout objects
+    before moving on. Stops after `max_pages` pages when set.
+    """
+    import pdfplumber
+
     with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
+        for i, page in enumerate(pdf.pages):
+            if max_pages is not None and i >= max_pages:
+                break
             t = page.extract_text() or ""
-            if t.strip():
-                chunks.append(t)
+            page.close()
+            yield t
+
+
+def extract_text_streaming(pdf_path: str, *, max_pages: int | None = None,
+                           stop_when_complete: bool = True) -> str:
+    """
+    Streaming variant of extract_text_from_pdf: reads pages until every EARLY_EXIT_FIELDS
+    entry has been found by the labelled-field rules (see prefill_fields), or until
+    `max_pages` / the last page. Attachments behind the form are never parsed once the
+    form is covered.
+    """
+    chunks: list[str] = []
+    covered: set[str] = set()
+    for t in iter_pdf_pages(pdf_path, max_pages=max_pages):
+        if not t.strip():
+            continue
+        chunks.append(t)
+        if stop_when_complete:
+            # has_signature=False counts as found: it is exactly what must not be skipped
+            covered.update(k for k, v in prefill_fields(t).items() if v is not None and v != "")
+            if covered.issuperset(EARLY_EXIT_FIELDS):
+                break
     return "\n\n".join(chunks).strip()
 
 
@@ -37,6 +222,28 @@ def normalize_text(text: str) -> str:
     return text.strip()
 
 
+@functools.lru_cache(maxsize=1)
+def _char_class_table() -> dict[int, Any]:
+    """
+    str.translate table classifying every char in one C-level pass:
+    WEIRD_CHARS -> "\x01", anything str.isdigit() accepts (all of Unicode) -> "\x02",
+    and the two marker chars themselves are deleted so they cannot be miscounted.
+    """
+    table: dict[int, Any] = {cp: "\x02" for cp in range(sys.maxunicode + 1) if chr(cp).isdigit()}
+    table.update({ord(ch): "\x01" for ch in WEIRD_CHARS})
+    table[1] = None
+    table[2] = None
+    return table
+
+
+def char_class_counts(text: str) -> tuple[int, int]:
+    """
+    (weird char count, digit count) for `text`, from a single translate pass.
+    """
+    classified = text.translate(_char_class_table())
+    return classified.count("\x01"), classified.count("\x02")
+
+
 def _looks_ocr_noisy(text: str) -> bool:
     """
     Heuristic: if the text has a suspicious amount of digit substitutions / weird punctuation,
@@ -45,9 +252,9 @@ def _looks_ocr_noisy(text: str) -> bool:
     if not text:
         return False
 
-    weird_chars = "@#$%^&*_=+~<>"
-    weird_ratio = sum(1 for ch in text if ch in weird_chars) / max(len(text), 1)
-    digit_ratio = sum(1 for ch in text if ch.isdigit()) / max(len(text), 1)
+    weird, digits = char_class_counts(text)
+    weird_ratio = weird / max(len(text), 1)
+    digit_ratio = digits / max(len(text), 1)
 
     # Tune thresholds as needed
     return weird_ratio > 0.01 or digit_ratio > 0.12
@@ -56,7 +263,8 @@ def _looks_ocr_noisy(text: str) -> bool:
 def _name_has_unusual_chars(name: str) -> bool:
     if not name:
         return False
-    return any(ch in name for ch in "@#$%^&*_=+~<>") or any(ch.isdigit() for ch in name)
+    weird, digits = char_class_counts(name)
+    return weird > 0 or digits > 0
 
 
 def _coerce_bool(v: Any) -> Any:
@@ -74,26 +282,104 @@ def _coerce_bool(v: Any) -> Any:
         return False
     return v
 
-def extract_fields(llm, text: str) -> Dict[str, Any]:
+def _rule_value(field: str, value: str) -> Any:
+    """
+    Map a labelled value onto the schema, or return None when it is not a confident match.
+    """
+    v = value.strip()
+    key = v.lower().rstrip(".")
+    if field == "transfer_type":
+        return TRANSFER_TYPE_VALUES.get(key)
+    if field == "account_type":
+        return ACCOUNT_TYPE_VALUES.get(key)
+    if field == "has_signature":
+        return SIGNATURE_VALUES.get(key)
+    if field == "client_email":
+        return v if EMAIL_RE.match(v) else None
+    if field == "client_phone":
+        return v if PHONE_RE.match(v) and sum(ch.isdigit() for ch in v) >= 7 else None
+    if field == "account_number_last4":
+        return v if LAST4_RE.match(v) else None
+    if field == "requested_date":
+        return v if DATE_RE.match(v) else None
+    if field == "client_full_name":
+        return None if _name_has_unusual_chars(v) else v
+    return v or None
+
+
+def prefill_fields(text: str) -> Dict[str, Any]:
     """
-    Uses the LLM to extract structured fields from document text.
-    Returns a dict. Includes `_raw_text` so validation can evaluate source quality.
+    Deterministic pre-extraction from labelled lines ("Email: ...", "Account Type: TFSA").
+    Returns only the fields it is confident about: values must pass the field's format
+    check, and a field labelled twice with different values is dropped.
+    Noisy/OCR text returns nothing so the LLM (and its null-over-guessing rule) decides.
     """
+    if not text or _looks_ocr_noisy(text):
+        return {}
+
+    found: Dict[str, Any] = {}
+    conflicted: set[str] = set()
+    for m in LABEL_LINE_RE.finditer(text):
+        field = _LABEL_TO_FIELD[m.group(1).lower()]
+        value = _rule_value(field, m.group(2))
+        if value is None:
+            continue
+        if field in found and found[field] != value:
+            conflicted.add(field)
+        found.setdefault(field, value)
+
+    for field in conflicted:
+        found.pop(field, None)
+    return found
+
+
+def _env_setting(name: str, default: Any) -> Any:
+    raw = (os.getenv(name) or "").strip()
+    return type(default)(raw) if raw else default
+
+
+def _llm_extract(llm, text: str, model: str | None = None) -> Dict[str, Any]:
     messages = [
         {"role": "system", "content": EXTRACT_SYSTEM},
         {"role": "user", "content": EXTRACT_USER.format(document_text=text)},
     ]
-
-    raw = llm.chat(messages, temperature=0.1, json_mode=True)
-
     # llm.chat(json_mode=True) should return a JSON object string.
     # We keep parsing inside this function so upstream callers always get dict.
-    import json
-    fields = json.loads(raw)
+    if model:
+        return json.loads(llm.chat(messages, temperature=0.1, json_mode=True, model=model))
+    return json.loads(llm.chat(messages, temperature=0.1, json_mode=True))
+
+
+def _llm_extract_budgeted(llm, text: str, *, budget: int, long_mode: str, max_chunks: int,
+                          model: str | None = None) -> tuple[dict, dict]:
+    """
+    One LLM extraction whose prompt text stays within `budget` estimated tokens, or
+    (map_reduce) at most `max_chunks` concurrent ones. Returns (fields, prompt info).
+    """
+    tokens = estimate_tokens(text)
+    if tokens <= budget:
+        return _llm_extract(llm, text, model), {"mode": "full", "tokens": tokens, "calls": 1}
 
-    # Attach raw text for validation heuristics (not for display)
-    fields["_raw_text"] = text
+    if long_mode == "map_reduce":
+        chunks = chunk_sections(text, budget_tokens=budget, max_chunks=max_chunks, score=_SECTION_SCORER)
+        with ThreadPoolExecutor(max_workers=len(chunks), thread_name_prefix="extract-chunk") as pool:
+            futures = [pool.submit(contextvars.copy_context().run, _llm_extract, llm, c, model) for c in chunks]
+            partials = [f.result() for f in futures]
+        fields = merge_partial_fields(partials, enum_fields=ENUM_FIELDS)
+        info = {"mode": "map_reduce", "tokens": sum(estimate_tokens(c) for c in chunks), "calls": len(chunks)}
+        return fields, info
 
+    selected, sel = select_sections(text, budget_tokens=budget, score=_SECTION_SCORER)
+    info = {"mode": "select", "tokens": sel["tokens_out"], "calls": 1,
+            "sections_kept": sel["kept"], "sections": sel["sections"]}
+    return _llm_extract(llm, selected, model), info
+
+
+def _extract_budget() -> int:
+    return _env_setting("EXTRACT_TOKEN_BUDGET", EXTRACT_TOKEN_BUDGET)
+
+
+def _normalize_llm_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
     # Normalize/clean common fields if present
     if "client_email" in fields and fields["client_email"]:
         fields["client_email"] = str(fields["client_email"]).strip()
@@ -108,9 +394,92 @@ def extract_fields(llm, text: str) -> Dict[str, Any]:
     return fields
 
 
-def validate_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+def extract_fields(llm, text: str, *, token_budget: int | None = None, long_mode: str | None = None,
+                   max_chunks: int | None = None, model: str | None = None) -> Dict[str, Any]:
+    """
+    Extract structured fields from document text.
+    Labelled fields are filled by `prefill_fields`; the LLM is only called when a
+    required field is still missing, and rule values win over model values.
+    Document text sent to the LLM is capped at `token_budget` estimated tokens per call
+    (EXTRACT_TOKEN_BUDGET); longer documents are trimmed to their most relevant sections
+    or, with long_mode="map_reduce", extracted chunk by chunk (see prompt_budget).
+    `model` overrides the client's model (see cascade.extract_fields_cascade).
+    Returns a dict. Includes `_extraction` ("rules" | "llm" | "rules+llm") recording
+    which path ran, and `_prompt` (mode, estimated tokens, calls) when the LLM ran.
+    The source text is not copied in; pass it to `validate_fields`.
+    """
+    prefilled = prefill_fields(text)
+    if all(prefilled.get(k) for k in REQUIRED_FIELDS):
+        fields: Dict[str, Any] = {
+            "client_full_name": None,
+            "client_email": None,
+            "client_phone": None,
+            "sending_institution": None,
+            "receiving_institution": None,
+            "transfer_type": "UNKNOWN",
+            "account_type": "UNKNOWN",
+            "account_number_last4": None,
+            "requested_date": None,
+            "has_signature": None,
+        }
+        fields.update(prefilled)
+        fields["_extraction"] = "rules"
+        return fields
+
+    fields, prompt_info = _llm_extract_budgeted(
+        llm,
+        text,
+        budget=token_budget or _extract_budget(),
+        long_mode=long_mode or _env_setting("EXTRACT_LONG_MODE", EXTRACT_LONG_MODE),
+        max_chunks=max_chunks or _env_setting("EXTRACT_MAX_CHUNKS", EXTRACT_MAX_CHUNKS),
+        model=model,
+    )
+    fields.update(prefilled)
+    fields["_extraction"] = "rules+llm" if prefilled else "llm"
+    fields["_prompt"] = prompt_info
+    return _normalize_llm_fields(fields)
+
+
+def combined_call_fits(text: str) -> bool:
+    """
+    Whether one extract+review call is likely to save a round trip: the LLM is needed
+    for extraction at all, the document fits one prompt, and nothing in the source
+    already guarantees a validation warning the draft could not know about.
+    """
+    if all(prefill_fields(text).get(k) for k in REQUIRED_FIELDS):
+        return False
+    if estimate_tokens(text) > _extract_budget():
+        return False
+    return not _looks_ocr_noisy(text)
+
+
+def extract_and_review(llm, text: str, *, token_budget: int | None = None) -> Dict[str, Any]:
+    """
+    Single-call mode: fields and a draft review from one LLM response.
+    Returns {"fields": ..., "draft_review": ...}. Fields match `extract_fields` output
+    (rule values still win); the draft is ungated until `finalize_review`.
+    """
+    document, selection = select_sections(text, budget_tokens=token_budget or _extract_budget(),
+                                          score=_SECTION_SCORER)
+    messages = [
+        {"role": "system", "content": COMBINED_SYSTEM},
+        {"role": "user", "content": COMBINED_USER.format(document_text=document)},
+    ]
+    out = json.loads(llm.chat(messages, temperature=0.1, json_mode=True))
+
+    prefilled = prefill_fields(text)
+    fields = dict(out.get("fields") or {})
+    fields.update(prefilled)
+    fields["_extraction"] = "rules+llm" if prefilled else "llm"
+    fields["_prompt"] = {"mode": "combined", "tokens": selection["tokens_out"], "calls": 1}
+    return {"fields": _normalize_llm_fields(fields), "draft_review": out.get("review") or {}}
+
+
+def validate_fields(fields: Dict[str, Any], text: Optional[str] = None) -> Dict[str, Any]:
     """
     Deterministic validation: produces PASS/WARN/FAIL with human-readable reasons.
+    `text` is the source document, used for source-quality heuristics; without it a
+    `_raw_text` key in `fields` (older extractions) is used.
     """
 
     errors: list[str] = []
@@ -118,13 +487,7 @@ def validate_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
     checks: dict[str, Any] = {}
 
     # Required fields (tune to your schema)
-    required = [
-        "client_full_name",
-        "receiving_institution",
-        "transfer_type",
-        "account_type",
-    ]
-    missing = [k for k in required if not fields.get(k)]
+    missing = [k for k in REQUIRED_FIELDS if not fields.get(k)]
     if missing:
         errors.extend([f"Missing required field: {k}" for k in missing])
 
@@ -152,7 +515,7 @@ def validate_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
         warnings.append("Signature indicator is ambiguous (verify).")
 
     # OCR/noise red flags
-    raw_text = fields.get("_raw_text", "")
+    raw_text = text if text is not None else fields.get("_raw_text", "")
     if _looks_ocr_noisy(raw_text):
         warnings.append("Source text appears OCR/noisy. Recommend human verification of extracted fields.")
 
@@ -195,10 +558,8 @@ def generate_review(llm, fields: Dict[str, Any], validation: Dict[str, Any]) ->
     Draft agent review + customer message + internal note in JSON,
     then apply deterministic decision gating based on validation.
     """
-    import json
-
-    # Remove raw text from what we send back to the model (avoid bloating prompt)
-    fields_for_model = {k: v for k, v in fields.items() if k != "_raw_text"}
+    # Remove raw text / internal markers from what we send back to the model (avoid bloating prompt)
+    fields_for_model = {k: v for k, v in fields.items() if not k.startswith("_")}
 
     messages = [
         {"role": "system", "content": REVIEW_SYSTEM},
@@ -214,12 +575,57 @@ def generate_review(llm, fields: Dict[str, Any], validation: Dict[str, Any]) ->
     raw = llm.chat(messages, temperature=0.2, json_mode=True)
     review = json.loads(raw)
 
-    # ---- Deterministic decision thresholds (override model output)
+    return _gate_model_review(review, validation)
+
+
+def draft_covers(draft_review: Dict[str, Any], validation: Dict[str, Any]) -> bool:
+    """
+    Whether a combined-call draft can stand as the review. It was written without the
+    validation findings, so it only can when there are none and the model also judged
+    the case clean; any finding has to be explained to the analyst and the customer.
+    """
+    return (
+        (validation.get("status") or "").upper() == "PASS"
+        and (draft_review.get("assumed_status") or "").upper() == "PASS"
+    )
+
+
+def finalize_review(llm, fields: Dict[str, Any], validation: Dict[str, Any],
+                    draft_review: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Gate a combined-call draft, or re-draft with `generate_review` (the second LLM call)
+    when validation changed what the review needs to say. `_draft` records which ran.
+    """
+    if not draft_covers(draft_review, validation):
+        review = generate_review(llm, fields, validation)
+        review["_draft"] = "regenerated"
+        return review
+    review = {k: v for k, v in draft_review.items() if k != "assumed_status"}
+    review["_draft"] = "combined"
+    return _gate_model_review(review, validation)
+
+
+def _gate_model_review(review: Dict[str, Any], validation: Dict[str, Any]) -> Dict[str, Any]:
+    # keep the model's own recommendation before the gate overrides recommended_next_step
+    review["model_recommended_next_step"] = review.get("recommended_next_step")
+    return apply_decision_gate(review, validation)
+
+
+def apply_decision_gate(review: Dict[str, Any], validation: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Deterministic decision thresholds (override model output). Pure: no LLM involved,
+    so stored reviews can be re-gated offline when validation or thresholds change.
+    The model's own recommendation is read from `model_recommended_next_step` (set when
+    the review is drafted). Reviews stored before that key existed fall back to their
+    already gated recommended_next_step for this decision, and the key stays unset: the
+    model's original recommendation is unknown for them.
+    """
     status = (validation.get("status") or "").upper()
     errors = validation.get("errors") or []
     warnings = validation.get("warnings") or []
 
-    model_next = (review.get("recommended_next_step") or "").upper()
+    model_next = review.get("model_recommended_next_step", review.get("recommended_next_step"))
+    model_next = (model_next or "").upper()
 
     if status == "FAIL" or len(errors) > 0:
         decision = "DO_NOT_APPROVE"
@@ -244,4 +650,4 @@ def generate_review(llm, fields: Dict[str, Any], validation: Dict[str, Any]) ->
     review["human_must_decide"] = {"decision": decision, "why": why}
     review["recommended_next_step"] = recommended
 
-    return review
\ No newline at end of file
+    return review
@@ -0,0 +1,140 @@
+"""
+Columnar re-implementation of `tools.validate_fields` for many cases at once.
+
+Same PASS/WARN/FAIL rules and messages (in the same order), computed with pandas
+vectorized string ops instead of one Python call per case. Used to re-check case
+history when a validation rule changes.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+
+from products.transfer_orchestrator.tools import (
+    EMAIL_RE,
+    LAST4_RE,
+    PHONE_RE,
+    REQUIRED_FIELDS,
+    char_class_counts,
+)
+
+FIELD_COLUMNS = REQUIRED_FIELDS + [
+    "client_email",
+    "client_phone",
+    "account_number_last4",
+    "has_signature",
+    "_raw_text",
+]
+
+
+def _to_frame(data: pd.DataFrame | Iterable[dict]) -> pd.DataFrame:
+    """
+    Object-dtype frame with every column validation reads. Missing values are None,
+    matching `fields.get(k)` on a dict (NaN in a DataFrame input is treated as missing).
+    """
+    if isinstance(data, pd.DataFrame):
+        df = data.reindex(columns=FIELD_COLUMNS).astype(object)
+        return df.where(df.notna(), None)
+    rows = list(data)
+    return pd.DataFrame(
+        {col: pd.Series([r.get(col) for r in rows], dtype=object) for col in FIELD_COLUMNS}
+    )
+
+
+def _truthy(s: pd.Series) -> np.ndarray:
+    return s.astype(bool).to_numpy()
+
+
+def _format_invalid(s: pd.Series, pattern: str) -> np.ndarray:
+    """
+    `value and not RE.match(str(value).strip())`
+    """
+    present = _truthy(s)
+    matches = s.astype(str).str.strip().str.match(pattern).to_numpy(dtype=bool)
+    return present & ~matches
+
+
+def _unknown(s: pd.Series) -> np.ndarray:
+    """
+    `str(value or "").upper() in {"UNKNOWN", ""}`
+    """
+    vals = s.where(_truthy(s), "").astype(str).str.upper()
+    return vals.isin(["UNKNOWN", ""]).to_numpy()
+
+
+def validate_fields_batch(data: pd.DataFrame | Iterable[dict]) -> pd.DataFrame:
+    """
+    Validate many extracted-field records at once.
+    data: DataFrame with one row per case (columns = field names, incl. `_raw_text`),
+    or an iterable of field dicts.
+    Returns a DataFrame (same row order/index as a DataFrame input) with columns
+    status, errors, warnings, checks; each row equals `validate_fields(row)`.
+    """
+    df = _to_frame(data)
+    n = len(df)
+
+    # errors
+    missing = {k: ~_truthy(df[k]) for k in REQUIRED_FIELDS}
+    sig = df["has_signature"]
+    sig_type = sig.map(type)
+    sig_false = ((sig_type == bool) & ~_truthy(sig)).to_numpy()
+    sig_none = sig.isna().to_numpy()
+    sig_str = (sig_type == str).to_numpy()
+
+    # warnings (checked in validate_fields order)
+    raw = df["_raw_text"]
+    has_raw = _truthy(raw)
+    raw_counts = np.array([char_class_counts(t) if ok else (0, 0) for t, ok in zip(raw, has_raw)],
+                          dtype=float).reshape(n, 2)
+    raw_len = np.maximum(np.where(has_raw, raw.map(lambda t: len(t) if t else 0).to_numpy(dtype=float), 1), 1)
+    ocr_noisy = has_raw & ((raw_counts[:, 0] / raw_len > 0.01) | (raw_counts[:, 1] / raw_len > 0.12))
+
+    names = df["client_full_name"].where(_truthy(df["client_full_name"]), "").astype(str)
+    name_counts = np.array([char_class_counts(t) if t else (0, 0) for t in names], dtype=int).reshape(n, 2)
+    name_unusual = (name_counts[:, 0] > 0) | (name_counts[:, 1] > 0)
+
+    warning_checks: list[tuple[np.ndarray, str]] = [
+        (_format_invalid(df["client_email"], EMAIL_RE.pattern), "Email format looks invalid."),
+        (_format_invalid(df["client_phone"], PHONE_RE.pattern), "Phone format looks unusual (verify)."),
+        (_format_invalid(df["account_number_last4"], LAST4_RE.pattern), "Account last4 should be exactly 4 digits."),
+        (~sig_false & sig_none, "Signature presence uncertain (verify)."),
+        (~sig_false & ~sig_none & sig_str, "Signature indicator is ambiguous (verify)."),
+        (ocr_noisy, "Source text appears OCR/noisy. Recommend human verification of extracted fields."),
+        (name_unusual, "Client name contains unusual characters (OCR/noise risk)."),
+        (_unknown(df["transfer_type"]), "Transfer type is UNKNOWN or missing confidence."),
+        (_unknown(df["account_type"]), "Account type is UNKNOWN or missing confidence."),
+    ]
+    error_checks: list[tuple[np.ndarray, str]] = [
+        (missing[k], f"Missing required field: {k}") for k in REQUIRED_FIELDS
+    ] + [(sig_false, "Signature explicitly missing.")]
+
+    def collect(checks: list[tuple[np.ndarray, str]]) -> list[list[str]]:
+        out: list[list[str]] = [[] for _ in range(n)]
+        for mask, msg in checks:
+            for i in np.flatnonzero(mask):
+                out[i].append(msg)
+        return out
+
+    errors = collect(error_checks)
+    warnings = collect(warning_checks)
+    n_err = np.array([len(e) for e in errors], dtype=int)
+    n_warn = np.array([len(w) for w in warnings], dtype=int)
+    required_present = ~np.logical_or.reduce([missing[k] for k in REQUIRED_FIELDS])
+
+    status = np.select([n_err > 0, n_warn > 0], ["FAIL", "WARN"], default="PASS")
+    checks: list[dict[str, Any]] = [
+        {
+            "required_fields_present": bool(required_present[i]),
+            "errors_count": int(n_err[i]),
+            "warnings_count": int(n_warn[i]),
+        }
+        for i in range(n)
+    ]
+
+    index = data.index if isinstance(data, pd.DataFrame) else pd.RangeIndex(n)
+    return pd.DataFrame(
+        {"status": status, "errors": errors, "warnings": warnings, "checks": checks},
+        index=index,
+    )
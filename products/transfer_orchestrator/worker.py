@@ -0,0 +1,166 @@
+"""
+Background workers for the transfer workflow.
+
+The Streamlit app only enqueues cases (see `enqueue_case`); worker processes lease jobs
+from the durable SQLite queue, run `MCPRouter.route`, save the case and record the result.
+
+Usage:
+    python -m products.transfer_orchestrator.worker --processes 4
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+
+from core.config import load_config
+from core.job_queue import JobQueue
+from core.llm_client import get_llm_client
+
+from products.transfer_orchestrator.db import artifact_store, init_db, save_case
+from products.transfer_orchestrator.workflow import build_router
+
+QUEUE_NAME = "transfer_cases"
+
+
+def get_queue() -> JobQueue:
+    return JobQueue(queue=QUEUE_NAME)
+
+
+def enqueue_case(case_id: str, source_name: str, document_text: str,
+                 field_corrections: dict | None = None) -> str:
+    """
+    Queue one case for the workers. The case ID doubles as the job ID, so
+    re-submitting a case replaces its pending job. Steps whose inputs did not
+    change since the case last ran are reused from its checkpoints.
+    The text goes to the artifact store; the job only carries its ref.
+    """
+    payload = {
+        "case_id": case_id,
+        "source_name": source_name,
+        "document_ref": artifact_store().put(document_text),
+        "field_corrections": field_corrections or {},
+    }
+    return get_queue().enqueue(payload, job_id=case_id)
+
+
+def pending_document_refs() -> set[str]:
+    """
+    Artifact refs that unfinished jobs still need (archive_cases must not delete them).
+    """
+    return {p["document_ref"] for p in get_queue().unfinished_payloads() if p.get("document_ref")}
+
+
+def handle_job(llm, job: dict) -> dict:
+    """
+    Run one leased job and persist the case. Returns the job result.
+    """
+    payload = job["payload"]
+    # jobs queued before document refs existed carry the text inline
+    document_text = payload.get("document_text")
+    if document_text is None:
+        document_text = artifact_store().get_text(payload["document_ref"])
+        if document_text is None:
+            raise LookupError(f"Document {payload['document_ref']} not found in the artifact store")
+    router, tools = build_router(llm)
+    state_out = router.route({
+        "document_text": document_text,
+        "case_id": payload["case_id"],
+        "field_corrections": payload.get("field_corrections") or {},
+    })
+    save_case(payload["case_id"], payload["source_name"], document_text, state_out)
+    return {
+        "case_id": payload["case_id"],
+        "validation_status": state_out.get("validation", {}).get("status"),
+        "decision": state_out.get("review", {}).get("human_must_decide", {}).get("decision"),
+        "tool_log": tools.get_log(),
+        "reused_steps": state_out.get("reused_steps", []),
+    }
+
+
+def _heartbeat(queue: JobQueue, job_id: str, worker_id: str, lease_s: float, done: threading.Event) -> None:
+    # keep the lease alive while the agent runs, so long jobs are not re-leased mid-run
+    while not done.wait(lease_s / 3):
+        if not queue.heartbeat(job_id, worker_id, lease_s=lease_s):
+            return
+
+
+def worker_loop(*, poll_s: float = 0.5, lease_s: float = 300.0, max_jobs: int | None = None) -> None:
+    """
+    Lease -> process -> complete/fail, until SIGTERM/SIGINT (or `max_jobs` processed).
+    """
+    stopping = False
+
+    def _stop(*_):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    queue = get_queue()
+    init_db()
+    llm = get_llm_client()
+    processed = 0
+
+    while not stopping and (max_jobs is None or processed < max_jobs):
+        job = queue.lease(worker_id, lease_s=lease_s)
+        if job is None:
+            time.sleep(poll_s)
+            continue
+        done = threading.Event()
+        beat = threading.Thread(target=_heartbeat, args=(queue, job["job_id"], worker_id, lease_s, done),
+                                name=f"heartbeat-{job['job_id']}", daemon=True)
+        beat.start()
+        try:
+            result = handle_job(llm, job)
+            if not queue.complete(job["job_id"], result, worker_id=worker_id):
+                print(f"[{worker_id}] job {job['job_id']}: lease lost before completion, result discarded",
+                      file=sys.stderr, flush=True)
+        except Exception as e:
+            status = queue.fail(job["job_id"], f"{e!r}\n{traceback.format_exc()}", worker_id=worker_id)
+            print(f"[{worker_id}] job {job['job_id']} failed (attempt {job['attempts']}): {e!r} -> "
+                  f"{status or 'lease lost'}", file=sys.stderr, flush=True)
+        finally:
+            done.set()
+            beat.join()
+        processed += 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run transfer workflow workers.")
+    parser.add_argument("--processes", type=int, default=2, help="worker processes")
+    parser.add_argument("--poll-s", type=float, default=0.5, help="sleep between polls when the queue is empty")
+    parser.add_argument("--lease-s", type=float, default=300.0, help="seconds before an unfinished job is re-leased")
+    args = parser.parse_args(argv)
+    load_config()
+
+    procs = [
+        mp.Process(target=worker_loop, kwargs={"poll_s": args.poll_s, "lease_s": args.lease_s}, daemon=False)
+        for _ in range(max(1, args.processes))
+    ]
+    for p in procs:
+        p.start()
+    print(f"Started {len(procs)} workers on queue '{QUEUE_NAME}'", flush=True)
+
+    def _forward(signum, _frame):
+        for p in procs:
+            if p.is_alive():
+                os.kill(p.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, _forward)
+    signal.signal(signal.SIGINT, _forward)
+    for p in procs:
+        p.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,31 +1,95 @@
 from __future__ import annotations
+import os
 from core.agent_base import AgentBase
+from core.artifact_store import ArtifactStore
+from core.mcp_router import MCPRouter
+from core.metrics import ToolMetrics
+from core.state_manager import StateManager
+from core.step_graph import Step, StepGraph
+from core.tool_registry import ToolRegistry
+
+from products.transfer_orchestrator.cascade import CascadePolicy, extract_fields_cascade
+from products.transfer_orchestrator.db import CaseCheckpoints
+from products.transfer_orchestrator.tools import (
+    combined_call_fits,
+    extract_and_review,
+    extract_fields,
+    finalize_review,
+    generate_review,
+    validate_fields,
+)
+
+# "separate": extract and review are two LLM calls; "combined": one call returns both;
+# "auto": combined where `combined_call_fits` says the draft is likely to stand.
+REVIEW_MODES = ("separate", "combined", "auto")
+
 
 class TransferAgent(AgentBase):
     """
     Agentic orchestrator:
-    - calls tools in sequence
+    - runs tools as a step graph (each step declares its inputs/outputs)
     - routes based on validation status
     - halts at human approval boundary
-    """
 
-    def run(self, input_payload: dict) -> dict:
-        document_text = input_payload["document_text"]
+    Payload: document_text, plus optional case_id (enables per-step checkpoints in the
+    case store, so a re-run only recomputes steps whose inputs changed) and
+    field_corrections (analyst overrides applied on top of the extracted fields), and
+    review_mode (see REVIEW_MODES; default TRANSFER_REVIEW_MODE or "separate").
+    """
 
-        fields = self.tools.execute("extract_fields", text=document_text)
-        self.state.set("fields", fields)
+    def extract_step(self, outputs: str = "fields") -> Step:
+        return self.tool_step("extract_fields", inputs={"text": "document_text"}, outputs=outputs, checkpoint=True)
 
-        validation = self.tools.execute("validate_fields", fields=fields)
-        self.state.set("validation", validation)
+    def build_graph(self, *, corrected: bool = False, combined: bool = False) -> StepGraph:
+        if combined:
+            # one LLM call drafts the review with the fields; finalize_review only calls
+            # the model again if validation found something the draft could not know
+            return StepGraph([
+                self.tool_step("extract_and_review", inputs={"text": "document_text"},
+                               outputs=["fields", "draft_review"], checkpoint=True),
+                self.tool_step("validate_fields", inputs={"fields": "fields", "text": "document_text"},
+                               outputs="validation"),
+                Step("route", route_for_validation, inputs=["validation"], outputs="path"),
+                self.tool_step("finalize_review", inputs=["fields", "validation", "draft_review"],
+                               outputs="review", checkpoint=True),
+            ])
+        extracted_key = "extracted_fields" if corrected else "fields"
+        graph = StepGraph([
+            self.extract_step(extracted_key),
+            self.tool_step("validate_fields", inputs={"fields": "fields", "text": "document_text"},
+                           outputs="validation"),
+            Step("route", route_for_validation, inputs=["validation"], outputs="path"),
+            self.tool_step("generate_review", inputs=["fields", "validation"], outputs="review", checkpoint=True),
+        ])
+        if corrected:
+            graph.add(Step("apply_corrections", apply_corrections,
+                           inputs=["extracted_fields", "field_corrections"], outputs="fields"))
+        return graph
 
-        if validation["status"] == "FAIL":
-            path = "REQUEST_INFO"
-        else:
-            path = "READY_FOR_HUMAN_APPROVAL"
+    def run(self, input_payload: dict) -> dict:
+        corrections = input_payload.get("field_corrections") or {}
+        case_id = input_payload.get("case_id")
+        inputs = {"document_text": input_payload["document_text"]}
+        if corrections:
+            inputs["field_corrections"] = corrections
 
-        review = self.tools.execute("generate_review", fields=fields, validation=validation)
-        self.state.set("path", path)
-        self.state.set("review", review)
+        mode = choose_review_mode(
+            input_payload["document_text"],
+            corrected=bool(corrections),
+            setting=input_payload.get("review_mode") or os.getenv("TRANSFER_REVIEW_MODE", "separate"),
+        )
+        graph = self.build_graph(corrected=bool(corrections), combined=(mode == "combined"))
+        checkpoints = CaseCheckpoints(case_id) if case_id else None
+        self.run_graph(graph, inputs=inputs, checkpoints=checkpoints)
+        if checkpoints is not None and mode == "combined" and "extract_and_review" not in graph.reused:
+            # a correction re-run takes the two-call graph: store these fields as its
+            # extract_fields checkpoint so it only pays for the review
+            step = self.extract_step()
+            checkpoints.save(step.name, step.input_hash({"text": inputs["document_text"]}), self.state.get("fields"))
+        self.state.set("reused_steps", graph.reused)
+        self.state.set("review_mode", mode)
+        # state carries a ref to the document, never a copy of its text
+        self.state.set("document_ref", ArtifactStore.ref(input_payload["document_text"]))
 
         # explicit human gate (agent declares it)
         self.state.set("human_gate", {
@@ -34,4 +98,58 @@ class TransferAgent(AgentBase):
             "why": "Regulated operational action with financial/identity risk; requires human authorization."
         })
 
-        return self.state.snapshot()
\ No newline at end of file
+        return self.state.snapshot()
+
+
+def apply_corrections(extracted_fields: dict, field_corrections: dict) -> dict:
+    """
+    Analyst corrections win over extracted values.
+    """
+    fields = dict(extracted_fields)
+    fields.update(field_corrections)
+    return fields
+
+
+def choose_review_mode(text: str, *, corrected: bool, setting: str) -> str:
+    """
+    Per-case choice between the two-call and single-call graphs. Corrections always use
+    two calls: the review must be written for the corrected fields.
+    """
+    if setting not in REVIEW_MODES:
+        raise ValueError(f"Unknown review mode: {setting!r} (expected one of {REVIEW_MODES})")
+    if corrected or setting == "separate":
+        return "separate"
+    if setting == "combined" or combined_call_fits(text):
+        return "combined"
+    return "separate"
+
+
+def route_for_validation(validation: dict) -> str:
+    if validation["status"] == "FAIL":
+        return "REQUEST_INFO"
+    return "READY_FOR_HUMAN_APPROVAL"
+
+
+def build_router(llm, *, metrics: ToolMetrics | None = None,
+                 cascade: CascadePolicy | None = None) -> tuple[MCPRouter, ToolRegistry]:
+    """
+    Wire the transfer tools into a fresh agent + router.
+    Tools and state are per-run; the LLM client and `metrics` may be shared across runs and threads.
+    `cascade` (default: CascadePolicy.from_env()) runs extraction on a cheap model first.
+    CASE_DEADLINE_S bounds each run (a payload's deadline_s takes precedence).
+    """
+    tools = ToolRegistry(metrics=metrics)
+    cascade = cascade or CascadePolicy.from_env()
+    if cascade is not None:
+        tools.register("extract_fields", lambda text: extract_fields_cascade(llm, text, cascade, metrics=tools.metrics))
+    else:
+        tools.register("extract_fields", lambda text: extract_fields(llm, text))
+    tools.register("validate_fields", lambda fields, text: validate_fields(fields, text))
+    tools.register("generate_review", lambda fields, validation: generate_review(llm, fields, validation))
+    tools.register("extract_and_review", lambda text: extract_and_review(llm, text))
+    tools.register("finalize_review",
+                   lambda fields, validation, draft_review: finalize_review(llm, fields, validation, draft_review))
+
+    agent = TransferAgent(llm, tools, StateManager())
+    deadline_s = os.getenv("CASE_DEADLINE_S", "").strip()
+    return MCPRouter(agent, deadline_s=float(deadline_s) if deadline_s else None), tools